@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic task vault for benchmarking.
+
+Builds a realistic folder structure with:
+- Tasks with mixed date formats (YYYY-MM-DD, YYYY-M-D, M/D/YYYY)
+- Recurring tasks, research-tagged tasks and completed-but-unarchived tasks
+- Ideas with in progress / noodling / someday statuses
+- Memories, bugs and an archive of completed tasks
+- An import/ backlog, some of it without a type field
+
+Usage:
+    python3 generate-vault.py --size 10k --output /tmp/vault-10k
+"""
+
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Share of files per folder; the rest of the structure is derived from it
+FOLDER_MIX = {
+    "tasks": 0.50,
+    "ideas": 0.08,
+    "memories": 0.10,
+    "bugs": 0.04,
+    "templates": 0.01,
+    "completed": 0.22,
+    "import": 0.05,
+}
+
+WORDS = (
+    "review budget call client draft post email plan sync invoice renew "
+    "update course launch podcast interview notes research summary survey "
+    "website bug fix refactor design outline schedule book travel tax "
+    "report quarterly monthly weekly team hire onboard doc prep follow up"
+).split()
+
+TAGS = ["admin", "writing", "course", "podcast", "finance", "home", "team", "sales", "health"]
+RESEARCH_TAGS = ["research-review", "research-summary-needed"]
+RECURRENCES = ["weekly", "biweekly", "monthly", "quarterly", "yearly"]
+IDEA_STATUSES = ["in progress", "noodling", "someday"]
+IMPORT_TYPES = ["task", "idea", "memory", "bug", "template", None]
+FOLDER_TYPES = {"memories": "memory", "bugs": "bug", "templates": "template"}
+
+
+def parse_size(value):
+    """Parse sizes like '1k', '10k', '100k' or a plain integer."""
+    value = value.lower().strip()
+    if value.endswith("k"):
+        return int(float(value[:-1]) * 1000)
+    return int(value)
+
+
+def format_date(d, rng):
+    """Render a date in one of the formats found in real vaults."""
+    roll = rng.random()
+    if roll < 0.70:
+        return d.isoformat()
+    if roll < 0.85:
+        return f"{d.year}-{d.month}-{d.day}"
+    return f"{d.month}/{d.day}/{d.year}"
+
+
+def format_tags(tags, rng):
+    """Render tags either inline or as a block list."""
+    if rng.random() < 0.6:
+        return f"tags: [{', '.join(tags)}]\n"
+    return "tags:\n" + "".join(f"  - {tag}\n" for tag in tags)
+
+
+def make_body(rng, title):
+    """Build a markdown body; a few files carry large pasted notes."""
+    lines = [f"# {title}", ""]
+    paragraphs = rng.choice((1, 1, 2, 3))
+    if rng.random() < 0.02:
+        paragraphs = 200
+    for _ in range(paragraphs):
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 60))))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def make_title(rng):
+    """Build a short random title."""
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5)))
+
+
+def task_file(rng, today, completed=False):
+    """Frontmatter and body for a task."""
+    due = today + timedelta(days=rng.randint(-60, 60))
+    title = make_title(rng)
+    tags = rng.sample(TAGS, rng.randint(1, 3))
+    if rng.random() < 0.03:
+        tags.append(rng.choice(RESEARCH_TAGS))
+
+    header = "---\ntype: task\n"
+    header += f"due: {format_date(due, rng)}\n"
+    if rng.random() < 0.05:
+        recurrence = rng.choice(RECURRENCES)
+        header += f"recurrence: {recurrence}\n"
+        if recurrence in ("monthly", "quarterly"):
+            header += f"recurrence_day: {due.day}\n"
+    if completed:
+        header += f"completed: {format_date(due + timedelta(days=rng.randint(-3, 10)), rng)}\n"
+    header += format_tags(tags, rng)
+    header += "---\n"
+    return header + make_body(rng, title)
+
+
+def idea_file(rng, today):
+    """Frontmatter and body for an idea."""
+    header = "---\ntype: idea\n"
+    header += f"status: {rng.choice(IDEA_STATUSES)}\n"
+    header += format_tags(rng.sample(TAGS, rng.randint(1, 2)), rng)
+    header += "---\n"
+    return header + make_body(rng, make_title(rng))
+
+
+def simple_file(rng, today, file_type, created=True):
+    """Frontmatter and body for a memory, bug, template or import item."""
+    header = "---\n"
+    if file_type:
+        header += f"type: {file_type}\n"
+    if created:
+        header += f"created: {format_date(today - timedelta(days=rng.randint(0, 900)), rng)}\n"
+    header += format_tags(rng.sample(TAGS, 1), rng)
+    header += "---\n"
+    return header + make_body(rng, make_title(rng))
+
+
+def generate_vault(output, size, seed=0, today=None):
+    """Write a synthetic vault of roughly `size` files under `output`."""
+    rng = random.Random(seed)
+    today = today or date.today()
+    output = Path(output)
+
+    counts = {}
+    for folder, share in FOLDER_MIX.items():
+        (output / folder).mkdir(parents=True, exist_ok=True)
+        counts[folder] = max(1, int(size * share))
+
+    for folder, count in counts.items():
+        for i in range(count):
+            if folder == "tasks":
+                # A few completed tasks are waiting to be archived
+                content = task_file(rng, today, completed=rng.random() < 0.05)
+            elif folder == "completed":
+                content = task_file(rng, today - timedelta(days=rng.randint(0, 1500)), completed=True)
+            elif folder == "ideas":
+                content = idea_file(rng, today)
+            elif folder == "import":
+                content = simple_file(rng, today, rng.choice(IMPORT_TYPES))
+            else:
+                content = simple_file(rng, today, FOLDER_TYPES[folder])
+
+            name = f"{folder}-{i:06d}-{'-'.join(rng.sample(WORDS, 2))}.md"
+            (output / folder / name).write_text(content, encoding="utf-8")
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic task vault.")
+    parser.add_argument("--size", default="1k", help="number of files, e.g. 1k, 10k, 100k")
+    parser.add_argument("--output", required=True, help="directory to create the vault in")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    if output.exists() and any(output.iterdir()):
+        print(f"Error: {output} is not empty.", file=sys.stderr)
+        sys.exit(1)
+
+    counts = generate_vault(output, parse_size(args.size), args.seed)
+    print(f"Generated {sum(counts.values())} file(s) in {output}:")
+    for folder, count in counts.items():
+        print(f"  - {folder}/: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Benchmark the task-management scripts against synthetic vaults.
+
+For each vault size, every entry point is run twice against a fresh copy
+of the vault: once cold (no caches) and once warm (straight after, with
+whatever caches the first run left behind). Each run is timed, including
+the time from launch to its first byte of output, and, via an audit hook
+in the child interpreter, counts subprocesses spawned and files read and
+written under the vault.
+
+Entry points may carry arguments, so the single taskctl entry point is
+measured next to the per-script launches it replaces.
+
+For each size, the memory held per task in tasks/ is also measured for
+what the scripts keep in memory: the scanned record dicts, the compact
+TaskStore the views and --watch keep instead, and that store plus the
+due-date columns the views query. Frontmatter parsing throughput
+is measured in files per second for each parser path over every header
+in the vault: parse_frontmatter() as the scripts use it, its flat fast
+path alone, and PyYAML's libyaml loaders next to the pure-Python
+yaml.safe_load a naive parser would use.
+
+Results are saved as JSON so runs can be compared across versions:
+    python3 run-benchmarks.py --sizes 1k,10k
+    python3 run-benchmarks.py --sizes 1k --compare results/bench-0.2.2-....json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from importlib import import_module
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+SCRIPTS_DIR = REPO_DIR / "scripts"
+RESULTS_DIR = BENCH_DIR / "results"
+
+ENTRY_POINTS = [
+    "generate-daily-files.py",
+    "archive-tasks.py",
+    "normalize-dates.py",
+    "clean-imports.py",
+    "calculate-weeks.py",
+    "taskctl.py weeks",
+    "taskctl.py today",
+    "taskctl.py normalize archive this-week next-week",
+]
+
+CONFIG_TEMPLATE = """\
+paths:
+  tasks_root: "{root}"
+folders:
+  tasks: "tasks"
+  ideas: "ideas"
+  templates: "templates"
+  memories: "memories"
+  bugs: "bugs"
+  completed: "completed"
+  import: "import"
+links:
+  format: "obsidian"
+integrations:
+  research_system: false
+"""
+
+# Runs inside the child interpreter: counts audit events, then runs the
+# script as __main__ and dumps the counters to a JSON file on exit.
+PROBE = r"""
+import atexit, json, os, runpy, sys, time
+
+stats_path, script = sys.argv[1], sys.argv[2]
+root = os.environ["TASK_BENCH_ROOT"]
+counts = {"subprocesses": 0, "file_reads": 0, "file_writes": 0}
+SPAWN_EVENTS = {"subprocess.Popen", "os.system", "os.posix_spawn", "os.spawn", "os.exec", "os.fork"}
+
+def hook(event, args):
+    if event in SPAWN_EVENTS:
+        counts["subprocesses"] += 1
+    elif event == "open":
+        path, mode, flags = args
+        if isinstance(path, int):
+            return
+        path = os.fsdecode(path)
+        if not path.startswith(root):
+            return
+        if mode is not None:
+            writing = any(c in mode for c in "wax+")
+        else:
+            writing = (flags & os.O_ACCMODE) != os.O_RDONLY
+        counts["file_writes" if writing else "file_reads"] += 1
+
+sys.addaudithook(hook)
+start = time.perf_counter()
+
+def dump():
+    counts["in_process_seconds"] = time.perf_counter() - start
+    with open(stats_path, "w") as f:
+        json.dump(counts, f)
+
+atexit.register(dump)
+sys.argv = [script] + sys.argv[3:]
+sys.path.insert(0, os.path.dirname(script))
+runpy.run_path(script, run_name="__main__")
+"""
+
+
+# Runs inside the child interpreter: loads tasks/ into one layout and
+# reports the bytes still allocated per task once the load is done.
+# Each layout gets a fresh interpreter so caches filled while measuring
+# one don't count against another.
+MEMORY_PROBE = r"""
+import gc, json, sys, tracemalloc
+
+sys.path.insert(0, sys.argv[1])
+from config import get_folder, get_view_sections
+from taskstore import TaskStore
+from vault import scan_folder
+
+folder = get_folder("tasks")
+count = len(scan_folder(folder))  # warm up imports and module caches
+rules = get_view_sections()
+
+def task_store():
+    # The record dicts are freed once the store is built
+    return TaskStore({"tasks": scan_folder(folder)}, ("tasks",))
+
+def task_store_columns():
+    store = task_store()
+    return store, store.due_columns(rules)
+
+LAYOUTS = {
+    "record_dicts": lambda: scan_folder(folder),
+    "task_store": task_store,
+    "task_store_columns": task_store_columns,
+}
+
+gc.collect()
+tracemalloc.start()
+kept = LAYOUTS[sys.argv[2]]()
+gc.collect()
+size = tracemalloc.get_traced_memory()[0]
+print(json.dumps({"tasks": count, "bytes_per_task": round(size / max(count, 1))}))
+"""
+
+MEMORY_LAYOUTS = ("record_dicts", "task_store", "task_store_columns")
+PARSE_PATHS = ("parse_frontmatter", "fast_path", "yaml_cbaseloader", "yaml_csafeloader", "yaml_safe_load")
+
+# Runs inside the child interpreter: reads every frontmatter block in the
+# vault once, then times each parser path over all of them (best of 3).
+PARSE_PROBE = r"""
+import json, sys, time
+
+sys.path.insert(0, sys.argv[1])
+import yaml
+from config import get_folder
+from fileio import read_frontmatter
+from vault import list_markdown_files, parse_frontmatter, _parse_flat
+
+headers = []
+for name in ("tasks", "ideas", "templates", "memories", "bugs", "completed", "import"):
+    folder = get_folder(name)
+    try:
+        entries = list_markdown_files(folder)
+    except FileNotFoundError:
+        continue
+    headers += [read_frontmatter(folder / entry.name)[0] for entry in entries]
+headers = [h for h in headers if h]
+# The lines between the --- delimiters, as the fast path and YAML see them
+inner = [h.split("\n")[1:-2] for h in headers]
+texts = ["\n".join(lines) for lines in inner]
+
+PATHS = {
+    "parse_frontmatter": lambda: [parse_frontmatter(h) for h in headers],
+    "fast_path": lambda: [_parse_flat(lines, True) for lines in inner],
+    "yaml_safe_load": lambda: [yaml.safe_load(t) for t in texts],
+}
+if hasattr(yaml, "CBaseLoader"):
+    PATHS["yaml_cbaseloader"] = lambda: [yaml.load(t, Loader=yaml.CBaseLoader) for t in texts]
+    PATHS["yaml_csafeloader"] = lambda: [yaml.load(t, Loader=yaml.CSafeLoader) for t in texts]
+
+result = {
+    "files": len(headers),
+    "yaml_fallback_share": round(
+        sum(_parse_flat(lines, True) is None for lines in inner) / max(len(inner), 1), 4),
+}
+for name, run in PATHS.items():
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    result[name] = round(len(headers) / max(min(timings), 1e-9))
+print(json.dumps(result))
+"""
+
+
+def get_version():
+    """Return the plugin version from plugin.json."""
+    with open(REPO_DIR / ".claude-plugin" / "plugin.json") as f:
+        return json.load(f)["version"]
+
+
+def make_home(home, root):
+    """Create a fake HOME whose config points the scripts at `root`."""
+    config_dir = Path(home) / ".claude" / "task-management-config"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    (config_dir / "config.yaml").write_text(CONFIG_TEMPLATE.format(root=root))
+
+
+def run_once(entry_point, root, home, stats_path):
+    """Run one entry point in a fresh interpreter and return its metrics."""
+    script, *args = entry_point.split()
+    # Unbuffered, so the first print reaches the pipe when it happens
+    env = dict(os.environ, HOME=str(home), TASK_BENCH_ROOT=str(root), PYTHONUNBUFFERED="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", PROBE, str(stats_path), str(SCRIPTS_DIR / script), *args],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    # Time to first output is what a user waiting on a command perceives
+    first_output = proc.stdout.read(1) and time.perf_counter() - start
+    _, stderr = proc.communicate()
+    stderr = stderr.decode(errors="replace")
+    returncode = proc.returncode
+    wall = time.perf_counter() - start
+
+    metrics = {"wall_seconds": round(wall, 4), "exit_code": returncode}
+    if first_output:
+        metrics["first_output_seconds"] = round(first_output, 4)
+    try:
+        with open(stats_path) as f:
+            stats = json.load(f)
+        stats["in_process_seconds"] = round(stats["in_process_seconds"], 4)
+        metrics.update(stats)
+    except (OSError, ValueError):
+        pass
+    if returncode != 0:
+        metrics["stderr"] = stderr.strip()[-2000:]
+    return metrics
+
+
+def measure_memory(root, home):
+    """Return bytes per task held by each in-memory layout of tasks/."""
+    env = dict(os.environ, HOME=str(home))
+    memory = {}
+    for layout in MEMORY_LAYOUTS:
+        proc = subprocess.run(
+            [sys.executable, "-c", MEMORY_PROBE, str(SCRIPTS_DIR), layout],
+            env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            return {"exit_code": proc.returncode, "stderr": proc.stderr.strip()[-2000:]}
+        result = json.loads(proc.stdout)
+        memory["tasks"] = result["tasks"]
+        memory[layout] = result["bytes_per_task"]
+    return memory
+
+
+def measure_parsing(home):
+    """Return frontmatter files parsed per second by each parser path."""
+    proc = subprocess.run(
+        [sys.executable, "-c", PARSE_PROBE, str(SCRIPTS_DIR)],
+        env=dict(os.environ, HOME=str(home)), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {"exit_code": proc.returncode, "stderr": proc.stderr.strip()[-2000:]}
+    return json.loads(proc.stdout)
+
+
+def bench_size(size_label, workdir, seed):
+    """
+    Benchmark every entry point against one vault size.
+
+    Returns (results per entry point, memory per task by layout,
+    frontmatter files per second by parser path).
+    """
+    generator = import_module("generate-vault")
+    base = Path(workdir) / f"vault-{size_label}"
+    generator.generate_vault(base, generator.parse_size(size_label), seed)
+
+    results = {}
+    for script in ENTRY_POINTS:
+        # Every script starts from an identical copy of the vault
+        slug = script.replace(" ", "_")
+        root = Path(workdir) / f"run-{size_label}-{slug}"
+        shutil.copytree(base, root)
+        home = Path(workdir) / f"home-{size_label}-{slug}"
+        make_home(home, root)
+
+        stats_path = Path(workdir) / "stats.json"
+        results[script] = {
+            "cold": run_once(script, root, home, stats_path),
+            "warm": run_once(script, root, home, stats_path),
+        }
+        print(f"  {script:50} cold {results[script]['cold']['wall_seconds']:8.3f}s"
+              f"   warm {results[script]['warm']['wall_seconds']:8.3f}s"
+              f"   first output {results[script]['warm'].get('first_output_seconds', 0):6.3f}s")
+
+        shutil.rmtree(root)
+        shutil.rmtree(home)
+
+    home = Path(workdir) / f"home-{size_label}-memory"
+    make_home(home, base)
+    memory = measure_memory(base, home)
+    parsing = measure_parsing(home)
+    shutil.rmtree(home)
+    if "tasks" in memory:
+        print(f"  memory per task ({memory['tasks']} tasks): "
+              f"dicts {memory['record_dicts']} B, "
+              f"store {memory['task_store']} B, "
+              f"store + columns {memory['task_store_columns']} B")
+    if "files" in parsing:
+        rates = ", ".join(f"{path} {parsing[path]:,}" for path in PARSE_PATHS if path in parsing)
+        print(f"  frontmatter files/s ({parsing['files']} files, "
+              f"{parsing['yaml_fallback_share']:.1%} need YAML): {rates}")
+
+    shutil.rmtree(base)
+    return results, memory, parsing
+
+
+def compare(current, previous):
+    """Print wall-time ratios between this run and a previous results file."""
+    print(f"\nCompared with version {previous.get('version')} ({previous.get('timestamp')}):")
+    for size_label, scripts in current["results"].items():
+        old_scripts = previous.get("results", {}).get(size_label)
+        if not old_scripts:
+            continue
+        print(f"  {size_label}:")
+        for script, runs in scripts.items():
+            for phase in ("cold", "warm"):
+                old = old_scripts.get(script, {}).get(phase)
+                if not old or not old.get("wall_seconds"):
+                    continue
+                ratio = runs[phase]["wall_seconds"] / old["wall_seconds"]
+                flag = "  <-- slower" if ratio > 1.2 else ""
+                print(f"    {script:50} {phase}: {old['wall_seconds']:.3f}s -> "
+                      f"{runs[phase]['wall_seconds']:.3f}s ({ratio:.2f}x){flag}")
+
+    for size_label, memory in current.get("memory_per_task", {}).items():
+        old = previous.get("memory_per_task", {}).get(size_label)
+        if not old or "tasks" not in old or "tasks" not in memory:
+            continue
+        print(f"  {size_label} memory per task:")
+        for layout in MEMORY_LAYOUTS:
+            if layout in old:
+                print(f"    {layout:50} {old[layout]} B -> {memory[layout]} B")
+
+    for size_label, parsing in current.get("frontmatter_files_per_second", {}).items():
+        old = previous.get("frontmatter_files_per_second", {}).get(size_label)
+        if not old or "files" not in old or "files" not in parsing:
+            continue
+        print(f"  {size_label} frontmatter files/s:")
+        for path in PARSE_PATHS:
+            if path in old and path in parsing:
+                print(f"    {path:50} {old[path]:,} -> {parsing[path]:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the task-management scripts.")
+    parser.add_argument("--sizes", default="1k,10k",
+                        help="comma-separated vault sizes (default: 1k,10k)")
+    parser.add_argument("--seed", type=int, default=0, help="vault generator seed")
+    parser.add_argument("--output", help="results file (default: results/bench-<version>-<time>.json)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BENCH_DIR))
+    version = get_version()
+    report = {
+        "version": version,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {},
+        "memory_per_task": {},
+        "frontmatter_files_per_second": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="task-bench-") as workdir:
+        for size_label in args.sizes.split(","):
+            size_label = size_label.strip()
+            print(f"Vault size {size_label}:")
+            results, memory, parsing = bench_size(size_label, workdir, args.seed)
+            report["results"][size_label] = results
+            report["memory_per_task"][size_label] = memory
+            report["frontmatter_files_per_second"][size_label] = parsing
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"bench-{version}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
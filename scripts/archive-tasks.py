@@ -3,83 +3,269 @@
 Archive completed one-time tasks from tasks/ to completed/.
 
 Recurring tasks (those with recurrence: field) are never archived.
+Archived tasks are always written as plain files; compact-completed.py
+later moves old ones into compressed pack files.
+
+Candidates are classified from parsed frontmatter in a single pass and
+moved with os.rename in batches. A task whose name is already taken in
+completed/ (ignoring case), or by an older task packed under
+completed/.packs/, is archived as name-2.md (then -3, ...) rather than
+left in tasks/. Every run is recorded in an append-only move journal
+(.archive-journal.jsonl under tasks_root) before anything is touched,
+so an interrupted run can be resumed with --resume or reverted with
+--undo. Use --dry-run to see what would move.
+
+Each archived task is also appended to the completion log (history.py)
+that task-stats.py reads.
 """
 
-import subprocess
+import argparse
+import json
+import os
+from datetime import datetime
 from pathlib import Path
 
+import history
 from config import get_tasks_root, get_folder
+from fileio import fsync, unique_name
+from packs import find_packed
+from vault import read_record, scan_vault
 
+JOURNAL_FILENAME = ".archive-journal.jsonl"
 
-def run_command(cmd):
-    """Run a shell command and return output."""
-    result = subprocess.run(
-        cmd,
-        shell=True,
-        cwd=get_tasks_root(),
-        capture_output=True,
-        text=True
-    )
-    return result.stdout.strip(), result.stderr.strip(), result.returncode
+# Moves are applied and journaled this many at a time
+BATCH_SIZE = 200
 
 
-def archive_completed_tasks():
-    """Archive completed one-time tasks to completed/ folder."""
-    tasks_dir = get_folder("tasks")
-    completed_dir = get_folder("completed")
+def get_journal_path():
+    """Return the path of the archive move journal."""
+    return get_tasks_root() / JOURNAL_FILENAME
 
-    # Grep for files with completed: field
-    stdout, stderr, code = run_command(
-        f"grep -il '^completed:' {tasks_dir}/*.md 2>/dev/null || true"
-    )
 
-    if not stdout:
-        print("No completed tasks to archive.")
-        return
+def append_journal(entries):
+    """Append entries to the move journal and flush them to disk."""
+    with open(get_journal_path(), 'a', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        f.flush()
+        fsync(f.fileno())
 
-    completed_files = stdout.split('\n')
-    archived = []
-    skipped = []
 
-    for file_path in completed_files:
-        if not file_path:
-            continue
+def read_journal():
+    """Return all journal entries grouped by run id, in run order."""
+    runs = {}
+    try:
+        with open(get_journal_path(), encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted write
+                    continue
+                runs.setdefault(entry['run'], []).append(entry)
+    except FileNotFoundError:
+        pass
+    return runs
+
 
-        # Check if it has recurrence field (recurring tasks don't get archived)
-        check_cmd = f"grep -q '^recurrence:' '{file_path}'"
-        _, _, has_recurrence = run_command(check_cmd)
+def classify_completed(records):
+    """
+    Split tasks/ records into those to archive and recurring ones to skip.
 
-        if has_recurrence == 0:  # grep found recurrence field
-            filename = Path(file_path).name
-            skipped.append(filename)
+    Only records with a completed: field are considered.
+    """
+    to_archive = []
+    skipped = []
+    for record in records:
+        if 'completed' not in record:
             continue
+        # Recurring tasks don't get archived
+        if 'recurrence' in record:
+            skipped.append(record)
+        else:
+            to_archive.append(record)
+    return to_archive, skipped
+
 
-        # Move to completed/
-        filename = Path(file_path).name
-        run_command(f"mv '{file_path}' '{completed_dir}/'")
-        archived.append(filename)
+def apply_moves(run_id, moves):
+    """
+    Rename each (src, dst) pair, journaling completed moves per batch.
+
+    Moves whose source is gone or whose destination already exists are
+    left alone. Returns the list of moves actually performed.
+    """
+    performed = []
+    for start in range(0, len(moves), BATCH_SIZE):
+        batch = []
+        for src, dst in moves[start:start + BATCH_SIZE]:
+            if not os.path.exists(src) or os.path.exists(dst):
+                continue
+            os.rename(src, dst)
+            batch.append([src, dst])
+        if batch:
+            append_journal([{'run': run_id, 'op': 'moved', 'moves': batch}])
+            performed.extend(batch)
+    return performed
+
+
+def archive_completed_tasks(records=None, dry_run=False):
+    """
+    Archive completed one-time tasks to completed/ folder.
+
+    Takes already-parsed tasks/ records when run as a pipeline stage.
+    Returns the records that were moved out of tasks/.
+    """
+    completed_dir = get_folder("completed")
+
+    # Find files with a completed: field from the frontmatter index
+    if records is None:
+        records = scan_vault(['tasks'])['tasks']
+
+    candidates, skipped = classify_completed(records)
+    if not candidates and not skipped:
+        print("No completed tasks to archive.")
+        return []
+
+    # Plan every move up front so name collisions are resolved before any
+    # rename, including with older tasks already moved into pack files.
+    # `taken` maps casefolded names (which collide on case-insensitive
+    # filesystems) to where the name is taken.
+    try:
+        taken = {name.casefold(): "completed/" for name in os.listdir(completed_dir)}
+    except FileNotFoundError:
+        taken = {}
+    for name, pack in find_packed([record['name'] for record in candidates]).items():
+        taken.setdefault(f"{name}.md".casefold(), f"completed/.packs/{pack}")
+    planned = []
+    renamed = []
+    for record in candidates:
+        name = record['path'].name
+        where = taken.get(name.casefold())
+        if where is not None:
+            name = unique_name(name, taken)
+            renamed.append((record, name, where))
+        taken[name.casefold()] = "completed/"
+        planned.append((record, completed_dir / name))
+
+    archived = []
+    if planned and dry_run:
+        archived = [record for record, _ in planned]
+    elif planned:
+        completed_dir.mkdir(parents=True, exist_ok=True)
+        run_id = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        moves = [[str(record['path']), str(dst)] for record, dst in planned]
+
+        # Write-ahead: the full plan is durable before anything moves
+        append_journal([{'run': run_id, 'op': 'plan', 'moves': moves}])
+        performed = {src for src, _ in apply_moves(run_id, moves)}
+        append_journal([{'run': run_id, 'op': 'commit'}])
+
+        archived = [record for record, _ in planned if str(record['path']) in performed]
+        # Log tasks under the name they have in completed/
+        history.record_completed([
+            dict(record, name=dst.stem) for record, dst in planned
+            if str(record['path']) in performed
+        ])
 
     # Report results
     if archived:
-        print(f"Archived {len(archived)} completed task(s):\n")
-        print("Moved to completed/:")
-        for f in archived:
-            print(f"  - {f}")
+        verb = "Would archive" if dry_run else "Archived"
+        print(f"{verb} {len(archived)} completed task(s):\n")
+        print("Would move to completed/:" if dry_run else "Moved to completed/:")
+        for record in archived:
+            print(f"  - {record['path'].name}")
+
+    if renamed:
+        verb = "Would rename" if dry_run else "Renamed"
+        print(f"\n{verb} {len(renamed)} task(s) whose name is already taken:")
+        for record, name, where in renamed:
+            print(f"  - {record['path'].name} -> {name} (name taken in {where})")
 
     if skipped:
         print(f"\nSkipped {len(skipped)} recurring task(s):")
-        for f in skipped:
-            print(f"  - {f} (has recurrence field, stays in tasks/)")
+        for record in skipped:
+            print(f"  - {record['path'].name} (has recurrence field, stays in tasks/)")
+        print("Run rollover-recurring.py to move them to their next due date.")
 
-    if archived:
+    if archived and not dry_run:
         print("\nTasks folder is now clean!")
-    elif not skipped:
+    elif not archived and not skipped:
         print("No completed tasks to archive.")
 
+    return archived
+
+
+def _find_run(runs, finished_ops):
+    """Return the most recent run id whose last op isn't in finished_ops."""
+    for run_id in reversed(list(runs)):
+        if runs[run_id][-1]['op'] not in finished_ops:
+            return run_id
+    return None
+
+
+def resume_archive():
+    """Finish the moves of the last run that was interrupted."""
+    runs = read_journal()
+    run_id = _find_run(runs, ('commit', 'undone'))
+    if run_id is None:
+        print("No interrupted archive run to resume.")
+        return
+
+    entries = runs[run_id]
+    done = {src for e in entries if e['op'] == 'moved' for src, _ in e['moves']}
+    remaining = [m for e in entries if e['op'] == 'plan' for m in e['moves'] if m[0] not in done]
+
+    if remaining:
+        Path(remaining[0][1]).parent.mkdir(parents=True, exist_ok=True)
+    performed = apply_moves(run_id, remaining)
+    history.record_completed([read_record(dst) for _, dst in performed])
+    append_journal([{'run': run_id, 'op': 'commit'}])
+
+    print(f"Resumed archive run {run_id}: moved {len(performed)} more file(s).")
+    for src, _ in performed:
+        print(f"  - {Path(src).name}")
+
+
+def undo_archive():
+    """Move the files of the last archive run back to where they came from."""
+    runs = read_journal()
+    run_id = _find_run(runs, ('undone',))
+    if run_id is None:
+        print("No archive run to undo.")
+        return
+
+    moved = [m for e in runs[run_id] if e['op'] == 'moved' for m in e['moves']]
+    restored = []
+    for src, dst in reversed(moved):
+        if os.path.exists(dst) and not os.path.exists(src):
+            os.rename(dst, src)
+            restored.append((src, dst))
+    history.record_removed([Path(dst).stem for src, dst in restored])
+    append_journal([{'run': run_id, 'op': 'undone'}])
+
+    print(f"Undid archive run {run_id}: restored {len(restored)} file(s) to tasks/.")
+    for src, _ in restored:
+        print(f"  - {Path(src).name}")
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Archive completed one-time tasks.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--dry-run", action="store_true",
+                       help="report what would move without touching disk")
+    group.add_argument("--resume", action="store_true",
+                       help="finish an interrupted archive run")
+    group.add_argument("--undo", action="store_true",
+                       help="move the last archive run's files back to tasks/")
+    args = parser.parse_args()
+
     print("=== Archiving Completed Tasks ===\n")
-    archive_completed_tasks()
+    if args.resume:
+        resume_archive()
+    elif args.undo:
+        undo_archive()
+    else:
+        archive_completed_tasks(dry_run=args.dry_run)
 
 
 if __name__ == "__main__":
@@ -7,12 +7,35 @@ Files with type: idea → ideas/
 Files with type: template → templates/
 Files with type: memory → memories/
 Files with type: bug → bugs/
+
+Every file's frontmatter is classified (in parallel, reading only the
+frontmatter) before anything moves. Moves are grouped by destination,
+and name collisions with files already there are resolved up front by a
+policy: skip (the default), rename to name-2.md, or overwrite. Use
+--bulk for large imports to get progress on stderr and a count-only
+summary.
+
+Incoming files are also looked up in the content-hash index (see
+dedup.py), which covers the destination folders and completed/, and
+against each other. By default exact duplicates stay in import/ and
+near-duplicates (same body, different frontmatter) are moved but
+listed; see DUPLICATE_POLICIES in config.py.
 """
 
-import subprocess
+import argparse
+import os
+import sqlite3
+import sys
 from pathlib import Path
 
-from config import get_tasks_root, get_folder, get_link_format
+import dedup
+from config import (
+    CONFLICT_POLICIES, DUPLICATE_POLICIES,
+    get_folder, get_import_conflict_policy, get_import_duplicate_policy,
+)
+from fileio import unique_name
+from formatting import format_link
+from vault import open_cache, scan_folder
 
 
 # Map type values to folder names
@@ -24,74 +47,206 @@ TYPE_TO_FOLDER = {
     "bug": "bugs",
 }
 
+# In --bulk mode, report progress every this many moves
+PROGRESS_EVERY = 500
+
+
+def destination_folder(record):
+    """
+    Return the folder name for a record's type, or None if it has no
+    known type. Only plain string values count; a list or mapping parsed
+    from `type:` is treated as unknown.
+    """
+    kind = record.get('type')
+    return TYPE_TO_FOLDER.get(kind) if isinstance(kind, str) else None
+
+
+def check_duplicates(records, index, policy):
+    """
+    Look up typed import records in the content-hash index and in the
+    batch itself.
+
+    Returns (records to move, hashes, duplicates): hashes maps source
+    path to its (exact, near) hashes; duplicates lists (file name, kind,
+    matching file, resolution) tuples.
+    """
+    keep = []
+    hashes = {}
+    duplicates = []
+    seen = {}  # hash -> import/ file earlier in this batch
+
+    typed = [r for r in records if destination_folder(r) is not None]
+    for record, digests in zip(typed, dedup.hash_files([r['path'] for r in typed])):
+        if digests is None:
+            continue
+        hashes[record['path']] = digests
+    for record in records:
+        digests = hashes.get(record['path'])
+        if digests is None:
+            keep.append(record)
+            continue
+
+        exact, near = digests
+        match = dedup.find_duplicate(index, exact, near)
+        if match:
+            kind, folder_name, path = match
+            matched = f"{folder_name}/{Path(path).name}"
+        elif exact in seen:
+            kind, matched = 'duplicate', seen[exact]
+        elif near in seen:
+            kind, matched = 'near-duplicate', seen[near]
+        else:
+            kind = None
+
+        name = record['path'].name
+        seen.setdefault(exact, f"import/{name}")
+        if near is not None:
+            seen.setdefault(near, f"import/{name}")
+
+        if kind is None:
+            keep.append(record)
+        elif policy == "skip-all" or (policy == "skip" and kind == 'duplicate'):
+            duplicates.append((name, kind, matched, "left in import/"))
+        elif policy in ("skip", "flag"):
+            duplicates.append((name, kind, matched, "moved"))
+            keep.append(record)
+        else:
+            raise ValueError(f"unknown duplicate policy: {policy!r}")
+
+    return keep, hashes, duplicates
+
+
+def plan_moves(records, policy):
+    """
+    Group import records by destination folder and resolve name collisions.
 
-def run_command(cmd):
-    """Run a shell command and return output."""
-    result = subprocess.run(
-        cmd,
-        shell=True,
-        cwd=get_tasks_root(),
-        capture_output=True,
-        text=True
-    )
-    return result.stdout.strip(), result.stderr.strip(), result.returncode
+    Each destination folder is listed once, so collisions with existing
+    files are known before anything moves. Returns (plan, skipped,
+    conflicts): plan maps folder name to (source path, destination path)
+    pairs; skipped lists files without a known type; conflicts lists
+    (file name, folder name, resolution) tuples.
+    """
+    by_folder = {}
+    skipped = []
+    for record in records:
+        folder_name = destination_folder(record)
+        if folder_name is None:
+            skipped.append(record['path'].name)
+        else:
+            by_folder.setdefault(folder_name, []).append(record['path'])
 
+    plan = {}
+    conflicts = []
+    for folder_name, paths in by_folder.items():
+        dest_folder = get_folder(folder_name)
+        # Compared casefolded, as names differing only in case collide
+        # on case-insensitive filesystems
+        try:
+            taken = {name.casefold() for name in os.listdir(dest_folder)}
+        except FileNotFoundError:
+            taken = set()
 
-def format_link(filename, folder):
-    """Format a link based on the configured link format."""
-    link_format = get_link_format()
-    if link_format == "markdown":
-        return f"[{filename}]({folder}/{filename}.md)"
-    else:
-        # Default to obsidian wiki-links
-        return f"[[{filename}]]"
+        moves = []
+        for path in paths:
+            name = path.name
+            if name.casefold() in taken:
+                if policy == "skip":
+                    conflicts.append((name, folder_name, "skipped"))
+                    continue
+                if policy == "rename":
+                    name = unique_name(name, taken)
+                    conflicts.append((path.name, folder_name, f"renamed to {name}"))
+                elif policy == "overwrite":
+                    conflicts.append((name, folder_name, "overwritten"))
+                else:
+                    raise ValueError(f"unknown conflict policy: {policy!r}")
+            taken.add(name.casefold())
+            moves.append((path, dest_folder / name))
+        if moves:
+            plan[folder_name] = moves
 
+    return plan, skipped, conflicts
 
-def clean_imports():
-    """Move files from import/ to appropriate folders based on type field."""
+
+def clean_imports(policy=None, bulk=False, duplicate_policy=None):
+    """
+    Move files from import/ to appropriate folders based on type field.
+
+    `policy` decides what happens when the destination already has a
+    file of the same name (default from imports.on_conflict in config);
+    `duplicate_policy` what happens to files whose content is already
+    in the vault (default from imports.on_duplicate). The duplicate
+    check is skipped if the content-hash index can't be used. In bulk
+    mode, progress is reported on stderr and the summary lists counts
+    per folder instead of every file.
+    """
     import_dir = get_folder("import")
+    if policy is None:
+        policy = get_import_conflict_policy()
+    if duplicate_policy is None:
+        duplicate_policy = get_import_duplicate_policy()
 
     # Check if import folder exists and has .md files
     if not import_dir.exists():
         print("Import folder does not exist.")
         return
 
-    md_files = list(import_dir.glob("*.md"))
-    if not md_files:
+    # Frontmatter is read with a bounded read, in parallel
+    cache = open_cache()
+    records = scan_folder(import_dir, cache)
+    if cache is not None:
+        cache.close()
+
+    if not records:
         print("No files in import/ folder.")
         return
 
-    moved = {}  # folder -> list of filenames
-    skipped = []  # files without type field
-
-    for file_path in md_files:
-        # Read file and look for type field
-        content = file_path.read_text()
-        file_type = None
-
-        for line in content.split('\n'):
-            if line.startswith('type:'):
-                file_type = line.split(':', 1)[1].strip()
-                break
-
-        if not file_type or file_type not in TYPE_TO_FOLDER:
-            skipped.append(file_path.name)
-            continue
+    index = None
+    hashes = {}
+    duplicates = []
+    if duplicate_policy != "off":
+        # Only files changed since the last run are read to refresh the index
+        index = dedup.open_index()
+        if index is not None:
+            try:
+                dedup.update_index(index)
+            except sqlite3.Error:
+                index.close()
+                index = None
+        if index is None:
+            print("Content-hash index unavailable (read-only or locked vault); "
+                  "skipping the duplicate check.\n")
+        else:
+            records, hashes, duplicates = check_duplicates(records, index, duplicate_policy)
 
-        # Move to appropriate folder
-        dest_folder_name = TYPE_TO_FOLDER[file_type]
-        dest_folder = get_folder(dest_folder_name)
+    plan, skipped, conflicts = plan_moves(records, policy)
+    total = sum(len(moves) for moves in plan.values())
 
-        # Ensure destination exists
-        dest_folder.mkdir(parents=True, exist_ok=True)
-
-        # Move file
-        dest_path = dest_folder / file_path.name
-        file_path.rename(dest_path)
+    moved = {}  # folder -> list of filenames
+    done = 0
+    for folder_name, moves in plan.items():
+        # One mkdir per destination rather than per file
+        moves[0][1].parent.mkdir(parents=True, exist_ok=True)
+        for src, dst in moves:
+            os.replace(src, dst)
+            moved.setdefault(folder_name, []).append(dst.stem)
+            done += 1
+            if bulk and done % PROGRESS_EVERY == 0:
+                print(f"  moved {done}/{total}...", file=sys.stderr, flush=True)
 
-        if dest_folder_name not in moved:
-            moved[dest_folder_name] = []
-        moved[dest_folder_name].append(file_path.stem)
+    if index is not None:
+        # Moved files keep their mtime, so their hashes stay valid
+        try:
+            dedup.record_hashes(index, [
+                (dst, folder_name, dst.stat(), hashes[src])
+                for folder_name, moves in plan.items()
+                for src, dst in moves
+                if src in hashes
+            ])
+        except sqlite3.Error:
+            # The next update hashes them from disk instead
+            pass
+        index.close()
 
     # Report results
     total_moved = sum(len(files) for files in moved.values())
@@ -103,25 +258,51 @@ def clean_imports():
             if folder_name in moved:
                 files = moved[folder_name]
                 print(f"{folder_name}/ ({len(files)} file{'s' if len(files) != 1 else ''}):")
-                for f in files:
-                    print(f"  - {format_link(f, folder_name)}")
+                if not bulk:
+                    for f in files:
+                        print(f"  - {format_link(f, folder_name)}")
                 print()
 
+    if conflicts:
+        print(f"Name collisions ({len(conflicts)}, policy: {policy}):")
+        for name, folder_name, resolution in conflicts:
+            print(f"  - {name} in {folder_name}/: {resolution}")
+        print()
+
+    if duplicates:
+        print(f"Duplicates ({len(duplicates)}, policy: {duplicate_policy}):")
+        if not bulk:
+            for name, kind, matched, resolution in duplicates:
+                print(f"  - {name}: {kind} of {matched}, {resolution}")
+        print()
+
     if skipped:
-        print(f"Skipped {len(skipped)} file(s) (no type field):")
-        for f in skipped:
-            print(f"  - {f}")
+        print(f"Skipped {len(skipped)} file(s) (no known type):")
+        if not bulk:
+            for f in skipped:
+                print(f"  - {f}")
         print()
 
     if total_moved > 0:
         print("Import cleanup complete!")
-    elif not skipped:
+    elif not skipped and not conflicts and not duplicates:
         print("No files to process.")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Move reviewed files out of import/ by type.")
+    parser.add_argument("--on-conflict", choices=CONFLICT_POLICIES,
+                        help="what to do when the destination already has a file of the same name "
+                             "(default: imports.on_conflict in config, else skip)")
+    parser.add_argument("--on-duplicate", choices=DUPLICATE_POLICIES,
+                        help="what to do with files whose content is already in the vault "
+                             "(default: imports.on_duplicate in config, else skip)")
+    parser.add_argument("--bulk", action="store_true",
+                        help="report progress and summarize counts instead of listing every file")
+    args = parser.parse_args()
+
     print("=== Cleaning Import Folder ===\n")
-    clean_imports()
+    clean_imports(args.on_conflict, args.bulk, args.on_duplicate)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Pack old completed tasks into compressed, append-only pack files.
+
+Tasks in completed/ whose completed: date (or, failing that, file
+modification time) is older than archive.pack_after_days are appended to
+completed/.packs/completed-<year>.pack and removed from completed/.
+Recently completed tasks stay as plain markdown files. A task whose name
+is already packed (ignoring case) is packed as name-2 (then -3, ...), so
+the older member stays readable with --extract.
+
+Examples:
+    python3 compact-completed.py
+    python3 compact-completed.py --older-than 365 --dry-run
+    python3 compact-completed.py --extract old-task-name
+    python3 compact-completed.py --rebuild-index
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+import packs
+from config import get_pack_after_days
+from dueindex import is_valid_date
+from fileio import unique_name
+from vault import scan_vault
+
+
+def completed_on(record):
+    """Return the YYYY-MM-DD a task was completed, falling back to its mtime."""
+    completed = record.get('completed')
+    if is_valid_date(completed):
+        return completed
+    return date.fromtimestamp(record['mtime_ns'] / 1e9).isoformat()
+
+
+def plan_names(records, old):
+    """
+    Return {path: member name} for the `old` records to pack, and the
+    (file name, member name, pack) renames of those whose name is
+    already packed. New names also avoid the other files in completed/.
+    """
+    packed = packs.find_packed([record['name'] for record, _ in old])
+    in_packs = {f"{name}.md".casefold(): pack for name, pack in packed.items()}
+    taken = set(in_packs) | {record['path'].name.casefold() for record in records}
+
+    names = {}
+    renamed = []
+    for record, _ in old:
+        name = record['path'].name
+        pack = in_packs.get(name.casefold())
+        if pack is not None:
+            name = unique_name(name, taken)
+            taken.add(name.casefold())
+            renamed.append((record['path'].name, name[:-3], pack))
+        names[record['path']] = name[:-3]
+    return names, renamed
+
+
+def report_renamed(renamed, dry_run):
+    if renamed:
+        verb = "Would pack" if dry_run else "Packed"
+        print(f"\n{verb} {len(renamed)} task(s) whose name is already packed under a new name:")
+        for filename, name, pack in renamed:
+            print(f"  - {filename} -> {name} (name taken in {pack})")
+
+
+def compact_completed(older_than=None, dry_run=False):
+    """
+    Pack completed tasks older than `older_than` days (default from config).
+
+    Returns the list of records that were packed.
+    """
+    if older_than is None:
+        older_than = get_pack_after_days()
+    cutoff = (date.today() - timedelta(days=older_than)).isoformat()
+
+    records = scan_vault(['completed'])['completed']
+    old = [(r, completed_on(r)) for r in records]
+    old = [(r, day) for r, day in old if day < cutoff]
+
+    if not old:
+        print(f"No completed tasks older than {older_than} days.")
+        return []
+
+    names, renamed = plan_names(records, old)
+
+    if dry_run:
+        print(f"Would pack {len(old)} completed task(s) older than {older_than} days:\n")
+        for record, day in old:
+            print(f"  - {record['path'].name} -> {packs.pack_path_for(day).name}")
+        report_renamed(renamed, dry_run)
+        return [r for r, _ in old]
+
+    by_pack = {}
+    for record, day in old:
+        by_pack.setdefault(packs.pack_path_for(day), []).append(record)
+
+    # Pack data is flushed before it's indexed, and indexed before the
+    # plain files are removed, so an interrupted run never loses a task
+    index = packs.open_index()
+    packed = []
+    for pack_path, pack_records in sorted(by_pack.items()):
+        members = []
+        for record in pack_records:
+            with open(record['path'], 'rb') as f:
+                members.append((names[record['path']], f.read(), record['mtime_ns']))
+        rows = packs.append_members(pack_path, members)
+        # Names were made unique above; never replace an older member
+        index.executemany("INSERT INTO members VALUES (?, ?, ?, ?, ?)", rows)
+        index.commit()
+
+        for record in pack_records:
+            os.unlink(record['path'])
+        packed.extend(pack_records)
+        print(f"Packed {len(pack_records)} task(s) into {pack_path.name}")
+    index.close()
+
+    report_renamed(renamed, dry_run)
+    print(f"\n{len(packed)} completed task(s) packed; {len(records) - len(packed)} left in completed/.")
+    return packed
+
+
+def extract(name):
+    """Print a packed task's content, returning False if it isn't packed."""
+    index = packs.open_index(create=False)
+    content = packs.read_member(index, name) if index is not None else None
+    if index is not None:
+        index.close()
+    if content is None:
+        return False
+    sys.stdout.write(content)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack old completed tasks into compressed pack files.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--extract", metavar="NAME",
+                       help="print a packed task's file content by name")
+    group.add_argument("--rebuild-index", action="store_true",
+                       help="rebuild the pack index from the pack files")
+    parser.add_argument("--older-than", type=int, metavar="DAYS",
+                        help="pack tasks completed more than DAYS days ago "
+                             "(default: archive.pack_after_days)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what would be packed without touching disk")
+    args = parser.parse_args()
+
+    if args.extract:
+        name = args.extract[:-3] if args.extract.endswith('.md') else args.extract
+        if not extract(name):
+            print(f"No packed task named {name}", file=sys.stderr)
+            sys.exit(1)
+    elif args.rebuild_index:
+        print(f"Indexed {packs.rebuild_index()} packed task(s).")
+    else:
+        print("=== Packing Completed Tasks ===\n")
+        compact_completed(args.older_than, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
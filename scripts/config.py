@@ -3,36 +3,169 @@
 Configuration loading utility for task-management plugin.
 
 Loads config from ~/.claude/task-management-config/config.yaml
+
+The parsed config is cached for the life of the process and only
+re-loaded when config.yaml's mtime or size changes. A precompiled JSON
+sidecar (config.json) is kept next to it so short-lived scripts can skip
+importing and running the YAML parser entirely.
 """
 
-import yaml
+import json
+import os
 from pathlib import Path
 
 CONFIG_DIR = Path.home() / ".claude" / "task-management-config"
 CONFIG_FILE = CONFIG_DIR / "config.yaml"
+CONFIG_SIDECAR = CONFIG_DIR / "config.json"
+
+# Names a vault from paths.vaults for scripts run outside the multi-vault driver
+VAULT_ENV = "TASK_MANAGEMENT_VAULT"
+
+# Threads used to read and parse files when scanning the vault
+DEFAULT_SCAN_WORKERS = 8
+
+# Completed tasks older than this many days are moved into pack files
+DEFAULT_PACK_AFTER_DAYS = 180
+
+# today.md sections defined by tag rules, used when views.sections isn't set
+DEFAULT_VIEW_SECTIONS = {
+    "Research": {"include": ["research-review", "research-summary-needed"]},
+}
+
+# What clean-imports does when a file with the same name already exists
+# in the destination (imports.on_conflict)
+CONFLICT_POLICIES = ("skip", "rename", "overwrite")
+
+# What clean-imports does with files whose content is already in the
+# vault (imports.on_duplicate):
+#   skip      leave exact duplicates in import/, move and list near-duplicates
+#   skip-all  leave exact and near-duplicates in import/
+#   flag      move both, but list them
+#   off       don't check
+DUPLICATE_POLICIES = ("skip", "skip-all", "flag", "off")
+
+# Process-wide cache: the stat signature of config.yaml, the parsed
+# config, and values derived from it (resolved folder paths, etc.)
+_cache = {"signature": None, "config": None, "derived": {}, "vault": None}
+
+
+def _load_sidecar(signature):
+    """Return the config from the JSON sidecar if it matches config.yaml."""
+    try:
+        with open(CONFIG_SIDECAR) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("source") != list(signature):
+        return None
+    return data.get("config")
+
+
+def _write_sidecar(signature, config):
+    """Best-effort write of the JSON sidecar; failures are ignored."""
+    tmp_path = CONFIG_SIDECAR.with_suffix(".json.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({"source": list(signature), "config": config}, f)
+        os.replace(tmp_path, CONFIG_SIDECAR)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _load_yaml():
+    """Parse config.yaml (yaml is only imported when actually needed)."""
+    import yaml
+
+    with open(CONFIG_FILE) as f:
+        return yaml.safe_load(f)
 
 
 def get_config():
     """Load and return the configuration dictionary."""
-    if not CONFIG_FILE.exists():
+    try:
+        st = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Configuration not found at {CONFIG_FILE}\n"
             "Run /task-management:setup to configure the plugin."
-        )
-    with open(CONFIG_FILE) as f:
-        return yaml.safe_load(f)
+        ) from None
+
+    signature = (st.st_mtime_ns, st.st_size)
+    if _cache["signature"] == signature:
+        return _cache["config"]
+
+    config = _load_sidecar(signature)
+    if config is None:
+        config = _load_yaml()
+        _write_sidecar(signature, config)
+
+    _cache["signature"] = signature
+    _cache["config"] = config
+    _cache["derived"] = {}
+    return config
+
+
+def _derived(key, compute):
+    """Return a value computed from the config, cached until it reloads."""
+    config = get_config()
+    derived = _cache["derived"]
+    if key not in derived:
+        derived[key] = compute(config)
+    return derived[key]
+
+
+def get_vaults():
+    """
+    Return {vault name: tasks root Path} for every configured vault.
+
+    Vaults are listed under paths.vaults; a config with only
+    paths.tasks_root has a single vault named "default".
+    """
+    paths = get_config()["paths"]
+    vaults = paths.get("vaults") or {}
+    if not vaults:
+        return {"default": Path(paths["tasks_root"])}
+    return {name: Path(root) for name, root in vaults.items()}
+
+
+def select_vault(name):
+    """Make every path lookup in this process resolve against vault `name`."""
+    if name is not None and name not in get_vaults():
+        raise ValueError(f"Unknown vault '{name}' (configured: {', '.join(get_vaults())})")
+    _cache["vault"] = name
+    _cache["derived"] = {}
 
 
 def get_tasks_root():
-    """Return the tasks root directory as a Path."""
-    return Path(get_config()["paths"]["tasks_root"])
+    """
+    Return the tasks root directory as a Path.
+
+    This is the selected vault's root (see select_vault() and the
+    TASK_MANAGEMENT_VAULT environment variable), else paths.tasks_root,
+    else the first vault in paths.vaults.
+    """
+    def resolve(config):
+        name = _cache["vault"] or os.environ.get(VAULT_ENV)
+        paths = config["paths"]
+        if name or "tasks_root" not in paths:
+            vaults = get_vaults()
+            if name not in vaults:
+                if name:
+                    raise ValueError(f"Unknown vault '{name}' (configured: {', '.join(vaults)})")
+                name = next(iter(vaults))
+            return vaults[name]
+        return Path(paths["tasks_root"])
+
+    return _derived("tasks_root", resolve)
 
 
 def get_folder(name):
     """Return the path to a specific folder within tasks root."""
-    config = get_config()
-    folder_name = config["folders"].get(name, name)
-    return get_tasks_root() / folder_name
+    def resolve(config):
+        folder_name = config["folders"].get(name, name)
+        return get_tasks_root() / folder_name
+
+    return _derived(("folder", name), resolve)
 
 
 def get_all_task_dirs():
@@ -55,3 +188,75 @@ def is_research_system_enabled():
     """Return True if research-system integration is enabled."""
     config = get_config()
     return config.get("integrations", {}).get("research_system", False)
+
+
+def get_scan_workers():
+    """Return the number of threads used to read files when scanning."""
+    config = get_config()
+    workers = config.get("performance", {}).get("scan_workers", DEFAULT_SCAN_WORKERS)
+    return max(1, int(workers))
+
+
+def get_pack_after_days():
+    """Return the age in days after which completed tasks are packed."""
+    config = get_config()
+    days = config.get("archive", {}).get("pack_after_days", DEFAULT_PACK_AFTER_DAYS)
+    return max(0, int(days))
+
+
+def get_view_sections():
+    """
+    Return the today.md sections as compiled tag rules, in config order.
+
+    Each rule is a dict with the section `name` and frozensets of
+    `include` and `exclude` tags. views.sections in config.yaml replaces
+    the default Research section.
+    """
+    def tag_set(name, key, tags):
+        # A single tag may be written as a scalar instead of a list
+        if not tags:
+            return frozenset()
+        if isinstance(tags, str):
+            return frozenset([tags])
+        if not isinstance(tags, list):
+            raise ValueError(
+                f"views.sections.{name}.{key} must be a tag or a list of tags, got {tags!r}"
+            )
+        return frozenset(str(tag) for tag in tags)
+
+    def compile_sections(config):
+        sections = config.get("views", {}).get("sections")
+        if sections is None:
+            sections = DEFAULT_VIEW_SECTIONS
+        rules = []
+        for name, rule in sections.items():
+            rule = rule or {}
+            rules.append({
+                "name": name,
+                "include": tag_set(name, "include", rule.get("include")),
+                "exclude": tag_set(name, "exclude", rule.get("exclude")),
+            })
+        return tuple(rules)
+
+    return _derived("view_sections", compile_sections)
+
+
+def _import_policy(key, policies):
+    config = get_config()
+    policy = (config.get("imports") or {}).get(key, "skip")
+    # YAML reads a bare `off` as false
+    if policy is False:
+        policy = "off"
+    if policy not in policies:
+        raise ValueError(f"imports.{key} must be one of {', '.join(policies)}, got {policy!r}")
+    return policy
+
+
+def get_import_conflict_policy():
+    """Return what clean-imports does on a name collision: skip, rename or overwrite."""
+    return _import_policy("on_conflict", CONFLICT_POLICIES)
+
+
+def get_import_duplicate_policy():
+    """Return what clean-imports does with duplicate content: skip, skip-all, flag or off."""
+    return _import_policy("on_duplicate", DUPLICATE_POLICIES)
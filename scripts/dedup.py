@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Content-hash index for task-management plugin.
+
+Every file in the destination folders of clean-imports and in completed/
+is hashed twice and kept in a SQLite index (.content-hashes.sqlite under
+tasks_root):
+
+- an exact hash of its normalized frontmatter plus body: fields sorted
+  by key, dates as YYYY-MM-DD, tags sorted, trailing whitespace and
+  line endings ignored;
+- a near hash of its body alone, lowercased with punctuation and
+  whitespace runs collapsed, so the same item exported again with a
+  different status, dates or tags still matches.
+
+Like the frontmatter cache, entries are keyed by path plus mtime and
+size, so an update only reads files that changed since the last one.
+Looking up an incoming file is then a single indexed query per hash.
+
+Files packed by compact-completed.py are not covered.
+"""
+
+import hashlib
+import importlib
+import json
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from config import get_tasks_root, get_folder, get_scan_workers
+from fileio import read_text
+from vault import list_markdown_files, split_frontmatter
+
+INDEX_FILENAME = ".content-hashes.sqlite"
+INDEX_VERSION = 1
+
+HASH_FOLDERS = ('tasks', 'ideas', 'templates', 'memories', 'bugs', 'completed')
+
+# Bodies with fewer words than this get no near hash; too short to tell apart
+MIN_NEAR_WORDS = 4
+
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+
+# Date parsing is shared with the normalize stage
+normalize_stage = importlib.import_module("normalize-dates")
+
+
+def open_index(root=None):
+    """
+    Open (creating if needed) the content-hash index under tasks_root.
+
+    Returns a sqlite3 connection, or None if the index can't be used
+    (e.g. a read-only or locked vault).
+    """
+    path = Path(root or get_tasks_root()) / INDEX_FILENAME
+    try:
+        conn = sqlite3.connect(path)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            conn.execute("DROP TABLE IF EXISTS hashes")
+            conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " path TEXT PRIMARY KEY,"
+            " folder TEXT NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " exact TEXT NOT NULL,"
+            " near TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS hashes_exact ON hashes (exact)")
+        conn.execute("CREATE INDEX IF NOT EXISTS hashes_near ON hashes (near)")
+        return conn
+    except sqlite3.Error:
+        return None
+
+
+def _digest(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _normalize_fields(fields):
+    """Return frontmatter fields in a canonical, order-independent form."""
+    normalized = {}
+    for key, value in fields.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if key in normalize_stage.DATE_FIELDS and value:
+                value = normalize_stage.parse_date(value)
+        elif key == 'tags':
+            value = sorted(value)
+        normalized[key] = value
+    if isinstance(normalized.get('tags'), str):
+        normalized['tags'] = [normalized['tags']] if normalized['tags'] else []
+    return normalized
+
+
+def content_hashes(content):
+    """Return (exact hash, near hash or None) for a file's full text."""
+    fields, body = split_frontmatter(content)
+    lines = [line.rstrip() for line in body.split('\n')]
+    body = '\n'.join(lines).strip('\n')
+    header = json.dumps(_normalize_fields(fields), sort_keys=True, separators=(',', ':'))
+    exact = _digest(header + '\n' + body)
+
+    words = NON_WORD_PATTERN.sub(' ', body.lower()).split()
+    near = _digest(' '.join(words)) if len(words) >= MIN_NEAR_WORDS else None
+    return exact, near
+
+
+def hash_file(path):
+    """Return content_hashes() for a file, or None if it can't be read."""
+    try:
+        return content_hashes(read_text(path))
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def hash_files(paths, workers=None):
+    """Hash files in parallel; returns a list aligned with `paths`."""
+    if workers is None:
+        workers = get_scan_workers()
+    if workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            return list(pool.map(hash_file, paths))
+    return [hash_file(path) for path in paths]
+
+
+def update_index(conn, folders=HASH_FOLDERS, workers=None):
+    """
+    Bring the index up to date with the files on disk.
+
+    Only new or changed files (by mtime and size) are read, in parallel;
+    entries for files that disappeared are dropped. Returns the number
+    of files (re)hashed.
+    """
+    known = {
+        row[0]: row[1:]
+        for row in conn.execute("SELECT path, mtime_ns, size FROM hashes")
+    }
+
+    changed = []
+    for name in folders:
+        folder = get_folder(name)
+        try:
+            entries = list_markdown_files(folder)
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            path = str(folder / entry.name)
+            hit = known.pop(path, None)
+            if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+                continue
+            changed.append((path, name, st))
+
+    # Anything left in `known` was deleted or moved since the last update
+    conn.executemany("DELETE FROM hashes WHERE path = ?", [(path,) for path in known])
+
+    hashes = hash_files([path for path, _, _ in changed], workers)
+    record_hashes(conn, [
+        (path, folder, st, digests)
+        for (path, folder, st), digests in zip(changed, hashes)
+        if digests is not None
+    ])
+    return len(changed)
+
+
+def record_hashes(conn, entries):
+    """
+    Store already computed hashes; `entries` is (path, folder, stat,
+    (exact, near)) tuples. Used after moving files whose content is
+    known, so the next update doesn't read them again.
+    """
+    conn.executemany(
+        "INSERT OR REPLACE INTO hashes (path, folder, mtime_ns, size, exact, near)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        [(str(path), folder, st.st_mtime_ns, st.st_size, exact, near)
+         for path, folder, st, (exact, near) in entries],
+    )
+    conn.commit()
+
+
+def find_duplicate(conn, exact, near):
+    """
+    Return ('duplicate' or 'near-duplicate', folder, path) for the first
+    indexed file matching the hashes, or None.
+    """
+    row = conn.execute("SELECT folder, path FROM hashes WHERE exact = ? LIMIT 1", (exact,)).fetchone()
+    if row:
+        return ('duplicate',) + row
+    if near is not None:
+        row = conn.execute("SELECT folder, path FROM hashes WHERE near = ? LIMIT 1", (near,)).fetchone()
+        if row:
+            return ('near-duplicate',) + row
+    return None
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Due-date parsing for task-management plugin.
+
+Dates are compared as day ordinals, so a YYYY-MM-DD string is parsed
+once into an int. The due-date index the views query by range is
+TaskColumns in taskstore.py, which keeps these ordinals in an array of
+machine ints sorted by due date.
+"""
+
+from datetime import date
+
+
+def date_ordinal(value):
+    """Return the day ordinal of a YYYY-MM-DD string, or 0 if it isn't a real date."""
+    if not isinstance(value, str) or len(value) != 10 or value[4] != '-' or value[7] != '-':
+        return 0
+    try:
+        return date(int(value[:4]), int(value[5:7]), int(value[8:])).toordinal()
+    except ValueError:
+        return 0
+
+
+def is_valid_date(value):
+    """Return True for a YYYY-MM-DD string naming a real date."""
+    return date_ordinal(value) != 0
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Atomic file writing utilities for task-management plugin.
+
+Files are written to a temporary sibling and renamed into place, so a
+crash never leaves a half-written task file behind. A batch writes all
+of its temp files first, then flushes each one to disk, renames them
+and syncs each parent directory once, so the disk work for the batch
+can overlap instead of being serialized file by file.
+
+Reads of task files go through read_text() or read_frontmatter() so the
+number of bytes read can be reported by --timings. read_frontmatter()
+stops at the closing `---` and never loads the body, which matters for
+task and memory files holding large pasted notes.
+"""
+
+import hashlib
+import mmap
+import os
+import shutil
+import sys
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+# Running total of task-file bytes read in this process
+IO_STATS = {'bytes_read': 0}
+_stats_lock = threading.Lock()
+
+# Frontmatter larger than this is treated as missing rather than read
+MAX_FRONTMATTER_BYTES = 64 * 1024
+
+# Files at least this large are read through mmap instead of a buffer
+MMAP_THRESHOLD = 1024 * 1024
+
+# A rewrite that replaces a file's frontmatter and copies its body
+# byte-for-byte from `body_offset` of the existing file. The header is
+# given with \n newlines and written with the file's own line endings.
+Splice = namedtuple('Splice', 'header body_offset')
+
+
+def _count_read(nbytes):
+    with _stats_lock:
+        IO_STATS['bytes_read'] += nbytes
+
+
+def _decode(data):
+    """Decode UTF-8 the way text-mode reads do, with newlines as \\n."""
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def read_text(path):
+    """Read a whole task file as UTF-8 text, counting the bytes read."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    _count_read(len(data))
+    return _decode(data)
+
+
+def read_text_newline(path):
+    """
+    Read a file like read_text(), also returning its newline style:
+    '\r\n' if it has any CRLF line ending, else '\n'. Text rewritten
+    from it should be written back with that style.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    _count_read(len(data))
+    return _decode(data), '\r\n' if b'\r\n' in data else '\n'
+
+
+class _MmapLines:
+    """Minimal readline(limit) over an mmap, which lacks a size limit."""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._pos = 0
+
+    def readline(self, limit):
+        end = self._buffer.find(b'\n', self._pos, self._pos + limit)
+        stop = self._pos + limit if end == -1 else end + 1
+        line = self._buffer[self._pos:stop]
+        self._pos += len(line)
+        return line
+
+
+def _read_header(stream):
+    """Read lines up to and including the closing `---`, within the cap."""
+    first = stream.readline(MAX_FRONTMATTER_BYTES)
+    if first.strip() != b'---':
+        return b''
+
+    chunks = [first]
+    total = len(first)
+    while total < MAX_FRONTMATTER_BYTES:
+        line = stream.readline(MAX_FRONTMATTER_BYTES - total)
+        if not line:
+            break
+        chunks.append(line)
+        total += len(line)
+        if line.strip() == b'---':
+            return b''.join(chunks)
+
+    # Unterminated or oversized frontmatter
+    return b''
+
+
+def read_frontmatter(path):
+    """
+    Read only a file's frontmatter block, without loading its body.
+
+    Returns (header_text, body_offset): the text from the opening `---`
+    through the closing `---` line, and the byte offset where the body
+    starts. Files without a (terminated, size-capped) frontmatter block
+    return ('', 0).
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                header = _read_header(_MmapLines(m))
+        else:
+            header = _read_header(f)
+
+    _count_read(len(header))
+    return _decode(header), len(header)
+
+
+def _encode_header(source, header, offset):
+    """
+    Encode a Splice header with the newline style of the header it
+    replaces, so a CRLF file keeps CRLF in front of its copied body.
+    """
+    with open(source, 'rb') as f:
+        raw = f.read(offset)
+    _count_read(len(raw))
+    if b'\r\n' in raw:
+        header = header.replace('\n', '\r\n')
+    return header.encode('utf-8')
+
+
+def _copy_body(source, offset, dest):
+    """Copy `source` from `offset` to the end into the open file `dest`."""
+    with open(source, 'rb') as src:
+        remaining = os.fstat(src.fileno()).st_size - offset
+        if hasattr(os, 'sendfile'):
+            dest.flush()
+            while remaining > 0:
+                sent = os.sendfile(dest.fileno(), src.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        else:
+            src.seek(offset)
+            shutil.copyfileobj(src, dest)
+
+
+def _temp_path(path):
+    """Return the temporary sibling path used while writing `path`."""
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def fsync(fd):
+    """
+    Flush an open file to stable storage.
+
+    On macOS fsync() only hands data to the drive, which may cache it;
+    F_FULLFSYNC asks the drive to write it through.
+    """
+    if sys.platform == 'darwin':
+        import fcntl
+        try:
+            fcntl.fcntl(fd, fcntl.F_FULLFSYNC)
+            return
+        except OSError:
+            # Not supported by this filesystem (e.g. some network mounts)
+            pass
+    os.fsync(fd)
+
+
+def _fsync_path(path):
+    """Flush a file already written and closed."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(directory):
+    """Flush a directory entry (the renames in it) to disk, if supported."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def unique_name(name, taken):
+    """
+    Return `name` or the first free `stem-N.md` variant not in `taken`.
+
+    `taken` holds casefolded names: on case-insensitive filesystems
+    (macOS, Windows) `Task.md` and `task.md` are the same file.
+    """
+    stem, suffix = os.path.splitext(name)
+    n = 2
+    while name.casefold() in taken:
+        name = f"{stem}-{n}{suffix}"
+        n += 1
+    return name
+
+
+def write_atomic_batch(contents):
+    """
+    Atomically write several files.
+
+    `contents` maps each path to its new text, or to a Splice to replace
+    just the frontmatter and copy the body from the existing file without
+    reading it into memory. All temp files are written first, then each
+    is flushed to disk and renamed into place; each parent directory is
+    synced once at the end. Returns the list of paths written.
+    """
+    if not contents:
+        return []
+
+    temps = []
+    try:
+        for path, text in contents.items():
+            path = Path(path)
+            tmp = _temp_path(path)
+            temps.append((tmp, path))
+            if isinstance(text, Splice):
+                header = _encode_header(path, text.header, text.body_offset)
+                with open(tmp, 'wb') as f:
+                    f.write(header)
+                    _copy_body(path, text.body_offset, f)
+            else:
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    f.write(text)
+
+        # Flush only after every temp file is written, so the kernel can
+        # already be writing back the earlier ones
+        for tmp, _ in temps:
+            _fsync_path(tmp)
+
+        for tmp, path in temps:
+            os.replace(tmp, path)
+    except BaseException:
+        for tmp, _ in temps:
+            if tmp.exists():
+                tmp.unlink()
+        raise
+
+    for directory in {path.parent for _, path in temps}:
+        _fsync_dir(directory)
+
+    return [path for _, path in temps]
+
+
+def write_atomic(path, text):
+    """Atomically replace a single file's content."""
+    write_atomic_batch({path: text})
+
+
+def write_if_changed(path, text):
+    """
+    Atomically write `path` only if its content hash would change.
+
+    Leaving identical files alone keeps their mtime, so sync clients and
+    editors don't see a change. Returns True if the file was written.
+    """
+    new_hash = hashlib.sha256(text.encode('utf-8')).digest()
+    try:
+        with open(path, 'rb') as f:
+            if hashlib.sha256(f.read()).digest() == new_hash:
+                return False
+    except FileNotFoundError:
+        pass
+
+    write_atomic(path, text)
+    return True
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Link and heading formatting shared by the generated views and reports.
+"""
+
+from config import get_link_format
+
+
+def format_date_header(date):
+    """Format date as 'Monday, October 7'."""
+    return date.strftime('%A, %B %-d')
+
+
+def format_link(filename, folder=None):
+    """Format a link based on the configured link format."""
+    link_format = get_link_format()
+    if link_format == "markdown":
+        if folder:
+            return f"[{filename}]({folder}/{filename}.md)"
+        return f"[{filename}]({filename}.md)"
+    else:
+        # Default to obsidian wiki-links
+        return f"[[{filename}]]"
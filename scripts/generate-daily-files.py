@@ -2,48 +2,55 @@
 """
 Generate today.md, this-week.md, and next-week.md files.
 
-This script:
-1. Normalizes dates in all task files
-2. Calculates current week and next week dates
-3. Archives completed tasks (moves them to completed/ folder)
-4. Greps for tasks by specific dates
-5. Generates the three daily files
+This script runs one in-process pipeline over a single scan of the vault:
+1. Scans all task folders once into an in-memory frontmatter index
+2. Normalizes dates in all task files
+3. Calculates current week and next week dates
+4. Archives completed tasks (moves them to completed/ folder)
+5. Loads the fields the views read into a compact task store
+6. Generates the three daily files
+
+Pass --timings (stderr) or --timings-json PATH to see how long each phase
+took and how much I/O it did, and --profile PATH for a cProfile dump.
+
+Pass --watch to keep running afterwards: only the compact task store
+(see taskstore.py) stays in memory, and only the views affected by a
+changed file are re-rendered.
 """
 
-import os
-import subprocess
-import sys
+import argparse
+import importlib
 from datetime import datetime, timedelta
-from pathlib import Path
 
 # Import config and dates from same directory
-from config import get_tasks_root, get_folder, get_link_format
+from config import get_tasks_root, get_folder, get_view_sections
 from dates import get_week_dates
-
-# Get directories from config
-BASE_DIR = get_tasks_root()
-TASKS_DIR = get_folder("tasks")
-IDEAS_DIR = get_folder("ideas")
-SCRIPTS_DIR = Path(__file__).parent
-
-def run_command(cmd, cwd=None):
-    """Run a shell command and return output."""
-    result = subprocess.run(
-        cmd,
-        shell=True,
-        cwd=cwd or BASE_DIR,
-        capture_output=True,
-        text=True
-    )
-    return result.stdout.strip(), result.stderr.strip(), result.returncode
-
-def normalize_dates():
-    """Run the normalize-dates.py script."""
+from fileio import write_if_changed
+from formatting import format_date_header, format_link
+from recurrence import occurrences, project
+from tagindex import matches_any
+from taskstore import TaskStore
+from timings import PhaseTimer
+from vault import scan_vault, read_record
+
+# The stage scripts have hyphenated filenames, so import them by name
+normalize_stage = importlib.import_module("normalize-dates")
+archive_stage = importlib.import_module("archive-tasks")
+
+# Folders whose changes can affect the views in --watch mode
+WATCHED_FOLDERS = ('tasks', 'ideas')
+
+# How often --watch wakes up to check for the date rolling over
+MIDNIGHT_CHECK_SECONDS = 60
+
+def load_vault():
+    """Scan every task folder once; all pipeline stages share the result."""
+    return scan_vault(normalize_stage.TASK_DIR_NAMES)
+
+def normalize_dates(vault):
+    """Normalize dates in the scanned files, updating their records."""
     print("Normalizing dates...")
-    stdout, stderr, code = run_command(f"python3 {SCRIPTS_DIR}/normalize-dates.py")
-    print(stdout)
-    if stderr:
-        print(f"Error: {stderr}", file=sys.stderr)
+    normalize_stage.normalize_dates(vault)
 
 def calculate_weeks():
     """Get week dates from dates module."""
@@ -54,127 +61,60 @@ def calculate_weeks():
     print(f"Next week: {dates['next_week_start']} to {dates['next_week_end']}")
     return dates
 
-def archive_completed_tasks():
-    """Run the archive-tasks.py script."""
+def archive_completed_tasks(vault):
+    """Archive completed tasks and drop them from the scanned tasks."""
     print("\nArchiving completed tasks...")
-    stdout, stderr, code = run_command(f"python3 {SCRIPTS_DIR}/archive-tasks.py")
-    if stdout:
-        # Skip the header line from archive-tasks.py since we already printed one
-        lines = stdout.split('\n')
-        for line in lines:
-            if not line.startswith("==="):
-                print(line)
-    if stderr:
-        print(f"Error: {stderr}", file=sys.stderr)
-
-def get_tasks_for_date(date):
-    """Get all tasks with a specific due date, excluding research tasks."""
-    stdout, stderr, code = run_command(
-        f"grep -l '^due: {date}$' {TASKS_DIR}/*.md 2>/dev/null || true"
-    )
-
-    if not stdout:
-        return []
-
-    # Extract just the filenames without path and extension, excluding research tasks
-    files = []
-    for path in stdout.split('\n'):
-        if not path:
-            continue
-
-        # Check if this is a research task (has research-review or research-summary-needed tag)
-        # Handle both single-line and multi-line YAML formats
-        tags_stdout, _, _ = run_command(f"grep -E '^tags:|^  - research' '{path}'")
-        if tags_stdout and ('research-review' in tags_stdout or 'research-summary-needed' in tags_stdout):
-            continue  # Skip research tasks
-
-        filename = Path(path).stem
-        files.append(filename)
+    archived = archive_stage.archive_completed_tasks(vault['tasks'])
+    if archived:
+        archived_paths = {record['path'] for record in archived}
+        vault['tasks'] = [r for r in vault['tasks'] if r['path'] not in archived_paths]
+
+def build_store(vault):
+    """Load the scanned tasks/ and ideas/ records into a compact TaskStore."""
+    return TaskStore(vault, WATCHED_FOLDERS)
+
+def build_due_index(store):
+    """Index the tasks outside today.md sections by due date."""
+    return store.due_columns(get_view_sections())
+
+def get_tasks_by_day(store, start, end):
+    """
+    Get task names due in [start, end] grouped by day, excluding sectioned
+    tasks. Upcoming occurrences of recurring tasks are projected in too,
+    so a weekly task also shows on next week's day.
+    """
+    due_index = build_due_index(store)
+    days = due_index.by_day(due_index.between(start, end))
+
+    recurring = [store.fields(due_index.row(row)) for row in due_index.recurring()]
+    for day_str, record in project(recurring, start, end):
+        names = days.setdefault(day_str, [])
+        if record['name'] not in names:
+            names.append(record['name'])
+            names.sort()
 
-    return files
-
-def get_overdue_tasks(today):
-    """Get all overdue tasks (due before today), excluding research tasks."""
-    # This is trickier - we need to grep for dates before today
-    # For simplicity, grep for any due: field, then filter
-    stdout, stderr, code = run_command(
-        f"grep -h '^due: ' {TASKS_DIR}/*.md 2>/dev/null || true"
-    )
-
-    if not stdout:
-        return []
-
-    # Now get the files for dates before today
-    overdue = []
-    today_date = datetime.strptime(today, '%Y-%m-%d')
+    return days
 
-    # Get all task files and check their dates
-    stdout, stderr, code = run_command(
-        f"grep -l '^due: ' {TASKS_DIR}/*.md 2>/dev/null || true"
-    )
+def get_tasks_for_date(due_index, date):
+    """Get all tasks with a specific due date, excluding sectioned tasks."""
+    return due_index.names_of(due_index.on(date))
 
-    if not stdout:
-        return []
+def get_overdue_tasks(due_index, today):
+    """Get all overdue tasks (due before today), excluding sectioned tasks."""
+    overdue = sorted(due_index.before(today), key=lambda row: due_index.names[row])
+    return [(due_index.names[row], due_index.due_str(row)) for row in overdue]
 
-    for file_path in stdout.split('\n'):
-        if not file_path:
-            continue
+def get_section_tasks(store):
+    """
+    Get the tasks in each configured today.md section (by default just
+    Research: research-review or research-summary-needed tags), as
+    (section name, task names) pairs in config order.
+    """
+    return list(store.sections(get_view_sections()).items())
 
-        # Check if this is a research task (has research-review or research-summary-needed tag)
-        # Handle both single-line and multi-line YAML formats
-        tags_stdout, _, _ = run_command(f"grep -E '^tags:|^  - research' '{file_path}'")
-        if tags_stdout and ('research-review' in tags_stdout or 'research-summary-needed' in tags_stdout):
-            continue  # Skip research tasks
-
-        # Get the due date from this file
-        date_stdout, _, _ = run_command(f"grep '^due: ' '{file_path}'")
-        if date_stdout:
-            due_date_str = date_stdout.split('due: ')[1].strip()
-            try:
-                due_date = datetime.strptime(due_date_str, '%Y-%m-%d')
-                if due_date < today_date:
-                    filename = Path(file_path).stem
-                    overdue.append((filename, due_date_str))
-            except ValueError:
-                # Invalid date format, skip
-                pass
-
-    return overdue
-
-def get_research_tasks():
-    """Get all research tasks (research-review or research-summary-needed tags)."""
-    # Get files with research tags
-    stdout, stderr, code = run_command(
-        f"grep -l 'research-review\\|research-summary-needed' {TASKS_DIR}/*.md 2>/dev/null || true"
-    )
-
-    if not stdout:
-        return []
-
-    files = []
-    for path in stdout.split('\n'):
-        if path:
-            filename = Path(path).stem
-            files.append(filename)
-
-    return files
-
-def get_in_progress_ideas():
+def get_in_progress_ideas(store):
     """Get all ideas with status: in progress."""
-    stdout, stderr, code = run_command(
-        f"grep -l '^status: in progress$' {IDEAS_DIR}/*.md 2>/dev/null || true"
-    )
-
-    if not stdout:
-        return []
-
-    files = []
-    for path in stdout.split('\n'):
-        if path:
-            filename = Path(path).stem
-            files.append(filename)
-
-    return files
+    return store.with_status('ideas', 'in progress')
 
 def generate_days_between(start_date, end_date):
     """Generate list of dates between start and end (inclusive)."""
@@ -189,23 +129,7 @@ def generate_days_between(start_date, end_date):
 
     return days
 
-def format_date_header(date):
-    """Format date as 'Monday, October 7'."""
-    return date.strftime('%A, %B %-d')
-
-
-def format_link(filename, folder=None):
-    """Format a link based on the configured link format."""
-    link_format = get_link_format()
-    if link_format == "markdown":
-        if folder:
-            return f"[{filename}]({folder}/{filename}.md)"
-        return f"[{filename}]({filename}.md)"
-    else:
-        # Default to obsidian wiki-links
-        return f"[[{filename}]]"
-
-def generate_today_md(dates):
+def generate_today_md(dates, store):
     """Generate today.md file."""
     print("\nGenerating today.md...")
 
@@ -213,10 +137,11 @@ def generate_today_md(dates):
     today_datetime = datetime.strptime(today, '%Y-%m-%d')
 
     # Get tasks
-    overdue = get_overdue_tasks(today)
-    due_today = get_tasks_for_date(today)
-    research = get_research_tasks()
-    ideas = get_in_progress_ideas()
+    due_index = build_due_index(store)
+    overdue = get_overdue_tasks(due_index, today)
+    due_today = get_tasks_for_date(due_index, today)
+    sections = get_section_tasks(store)
+    ideas = get_in_progress_ideas(store)
 
     # Generate content
     content = f"---\ndate: {today}\n---\n"
@@ -240,21 +165,26 @@ def generate_today_md(dates):
             content += f"- {format_link(filename, 'ideas')}\n"
         content += "\n"
 
-    if research:
-        content += "## Research\n"
-        for filename in research:
-            content += f"- [ ] {format_link(filename, 'tasks')}\n"
+    blocks = []
+    for name, filenames in sections:
+        if filenames:
+            block = f"## {name}\n"
+            for filename in filenames:
+                block += f"- [ ] {format_link(filename, 'tasks')}\n"
+            blocks.append(block)
+    content += "\n".join(blocks)
 
-    # Write file
-    with open(BASE_DIR / "today.md", 'w') as f:
-        f.write(content)
+    # Write file (only if it changed)
+    changed = write_if_changed(get_tasks_root() / "today.md", content)
 
     print(f"  - {len(overdue)} overdue task(s)")
     print(f"  - {len(due_today)} task(s) due today")
-    print(f"  - {len(research)} research task(s)")
+    for name, filenames in sections:
+        print(f"  - {len(filenames)} {name.lower()} task(s)")
     print(f"  - {len(ideas)} in-progress idea(s)")
+    return changed
 
-def generate_this_week_md(dates):
+def generate_this_week_md(dates, store):
     """Generate this-week.md file."""
     print("\nGenerating this-week.md...")
 
@@ -271,9 +201,7 @@ def generate_this_week_md(dates):
         content = f"---\nweek_start: {dates['this_week_start']}\nweek_end: {week_end}\n---\n"
         content += f"# This Week - Week ending {datetime.strptime(week_end, '%Y-%m-%d').strftime('%B %-d')}\n\n"
         content += "No tasks remaining this week.\n"
-        with open(BASE_DIR / "this-week.md", 'w') as f:
-            f.write(content)
-        return
+        return write_if_changed(get_tasks_root() / "this-week.md", content)
 
     # Get days between tomorrow and week end
     days = generate_days_between(tomorrow, week_end)
@@ -282,10 +210,12 @@ def generate_this_week_md(dates):
     content = f"---\nweek_start: {dates['this_week_start']}\nweek_end: {week_end}\n---\n"
     content += f"# This Week - Week ending {week_end_date.strftime('%B %-d')}\n\n"
 
+    tasks_by_day = get_tasks_by_day(store, tomorrow, week_end)
+
     total_tasks = 0
     for day in days:
         day_str = day.strftime('%Y-%m-%d')
-        tasks = get_tasks_for_date(day_str)
+        tasks = tasks_by_day.get(day_str, [])
 
         if tasks:
             content += f"## {format_date_header(day)}\n"
@@ -294,13 +224,13 @@ def generate_this_week_md(dates):
             content += "\n"
             total_tasks += len(tasks)
 
-    # Write file
-    with open(BASE_DIR / "this-week.md", 'w') as f:
-        f.write(content)
+    # Write file (only if it changed)
+    changed = write_if_changed(get_tasks_root() / "this-week.md", content)
 
     print(f"  - {total_tasks} task(s) across {len(days)} day(s)")
+    return changed
 
-def generate_next_week_md(dates):
+def generate_next_week_md(dates, store):
     """Generate next-week.md file."""
     print("\nGenerating next-week.md...")
 
@@ -316,10 +246,12 @@ def generate_next_week_md(dates):
     content = f"---\nweek_start: {week_start}\nweek_end: {week_end}\n---\n"
     content += f"# Next Week - Week of {week_start_date.strftime('%B %-d')}\n\n"
 
+    tasks_by_day = get_tasks_by_day(store, week_start, week_end)
+
     total_tasks = 0
     for day in days:
         day_str = day.strftime('%Y-%m-%d')
-        tasks = get_tasks_for_date(day_str)
+        tasks = tasks_by_day.get(day_str, [])
 
         if tasks:
             content += f"## {format_date_header(day)}\n"
@@ -328,31 +260,220 @@ def generate_next_week_md(dates):
             content += "\n"
             total_tasks += len(tasks)
 
-    # Write file
-    with open(BASE_DIR / "next-week.md", 'w') as f:
-        f.write(content)
+    # Write file (only if it changed)
+    changed = write_if_changed(get_tasks_root() / "next-week.md", content)
 
     print(f"  - {total_tasks} task(s) across {len(days)} day(s)")
+    return changed
 
-def main():
-    """Main function."""
+def run(timer, vault=None):
+    """
+    Run the full pipeline, recording each phase with `timer`. A vault
+    already scanned by the caller (e.g. taskctl) is used instead of
+    scanning again.
+
+    Returns (vault, dates, store): the scanned records and the compact
+    TaskStore the views were generated from.
+    """
     print("=== Generating Daily Task Files ===\n")
 
-    # Step 1: Normalize dates
-    normalize_dates()
+    # Step 1: Scan all task folders once for every stage
+    if vault is None:
+        with timer.phase("scan"):
+            vault = load_vault()
+
+    # Step 2: Normalize dates
+    with timer.phase("normalize"):
+        normalize_dates(vault)
+
+    # Step 3: Calculate weeks
+    with timer.phase("calculate_weeks"):
+        dates = calculate_weeks()
+
+    # Step 4: Archive completed tasks
+    with timer.phase("archive"):
+        archive_completed_tasks(vault)
+
+    # Step 5: Keep just the fields the views read
+    with timer.phase("index"):
+        store = build_store(vault)
+
+    # Step 6: Generate files (each is only rewritten if its content changed)
+    changed = []
+    with timer.phase("today"):
+        if generate_today_md(dates, store):
+            changed.append("today.md")
+    with timer.phase("this-week"):
+        if generate_this_week_md(dates, store):
+            changed.append("this-week.md")
+    with timer.phase("next-week"):
+        if generate_next_week_md(dates, store):
+            changed.append("next-week.md")
+
+    print(f"\nUpdated: {', '.join(changed)}" if changed else "\nAll views already up to date.")
+    print("\n=== Done! ===")
+    return vault, dates, store
+
+VIEW_GENERATORS = {
+    'today': generate_today_md,
+    'this-week': generate_this_week_md,
+    'next-week': generate_next_week_md,
+}
+
+def apply_changes(store, paths):
+    """
+    Re-read changed files, dropping their old entries from the store.
+
+    Returns (removed, added) lists of (folder name, record) pairs: the old
+    tasks that were replaced or deleted, as small record dicts, and the
+    freshly read records. The caller puts the added records into the
+    store once they have been normalized and archived.
+    """
+    folders = {get_folder(name): name for name in WATCHED_FOLDERS}
+    removed = []
+    added = []
+
+    for path in sorted(paths):
+        name = folders.get(path.parent)
+        if name is None:
+            continue
 
-    # Step 2: Calculate weeks
-    dates = calculate_weeks()
+        old = store.remove(name, path.stem)
+        if old is not None:
+            removed.append((name, store.fields(old)))
 
-    # Step 3: Archive completed tasks
-    archive_completed_tasks()
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+        record = read_record(path)
+        record['mtime_ns'] = mtime_ns
+        added.append((name, record))
+
+    return removed, added
+
+def affected_views(changes, dates):
+    """
+    Return the views whose content can depend on these records.
+
+    Besides its due date, a recurring task counts on every day the week
+    views project it onto, so changing or removing its rule re-renders
+    the views it was (or now is) projected into.
+    """
+    views = set()
+    for name, record in changes:
+        if name == 'ideas':
+            views.add('today')
+            continue
+        due = record.get('due') or ''
+        if matches_any(record, get_view_sections()) or (due and due <= dates['today']):
+            views.add('today')
+        days = [due] + occurrences(record, dates['tomorrow'], dates['next_week_end'])
+        if any(dates['tomorrow'] <= day <= dates['this_week_end'] for day in days):
+            views.add('this-week')
+        if any(dates['next_week_start'] <= day <= dates['next_week_end'] for day in days):
+            views.add('next-week')
+    return views
+
+def refresh_views(store, dates, paths):
+    """
+    Fold changed files into the store and re-render affected views.
+    Returns the names of the views whose files actually changed.
+    """
+    removed, added = apply_changes(store, paths)
+
+    changed = {name: [r for n, r in added if n == name] for name in WATCHED_FOLDERS}
+    if any(normalize_stage.needs_normalization(r) for _, r in added):
+        normalize_dates(changed)
+    archived_paths = set()
+    if any('completed' in r for r in changed['tasks']):
+        print("\nArchiving completed tasks...")
+        archived = archive_stage.archive_completed_tasks(changed['tasks'])
+        archived_paths = {record['path'] for record in archived}
+    for name, record in added:
+        if record['path'] not in archived_paths:
+            store.put(name, record)
+
+    views = affected_views(removed + added, dates)
+    return [
+        view for view, generate in VIEW_GENERATORS.items()
+        if view in views and generate(dates, store)
+    ]
+
+def watch_views(store, dates, debounce=1.0):
+    """
+    Keep the views up to date until interrupted.
+
+    Changes under tasks/ and ideas/ are collected until things have been
+    quiet for `debounce` seconds, then only the affected views are
+    re-rendered from the in-memory store. All views are re-rendered when
+    the date rolls over at midnight.
+    """
+    # Only --watch needs the watcher (and its ctypes import)
+    from watcher import create_watcher
+
+    watcher = create_watcher([get_folder(name) for name in WATCHED_FOLDERS])
+    print(f"\nWatching for changes ({type(watcher).__name__}). Press Ctrl-C to stop.")
+
+    pending = set()
+    try:
+        while True:
+            changed = watcher.wait(debounce if pending else MIDNIGHT_CHECK_SECONDS)
+            if changed:
+                pending |= changed
+                continue
+
+            if pending:
+                views = refresh_views(store, dates, pending)
+                pending = set()
+                if views:
+                    stamp = datetime.now().strftime('%H:%M:%S')
+                    updated = ', '.join(f"{view}.md" for view in views)
+                    print(f"[{stamp}] Updated {updated}")
+
+            current = get_week_dates()
+            if current['today'] != dates['today']:
+                dates = current
+                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] New day, rolling over all views")
+                for generate in VIEW_GENERATORS.values():
+                    generate(dates, store)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.close()
 
-    # Step 4: Generate files
-    generate_today_md(dates)
-    generate_this_week_md(dates)
-    generate_next_week_md(dates)
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Generate today.md, this-week.md and next-week.md.")
+    parser.add_argument("--timings", action="store_true",
+                        help="print per-phase timings and I/O counts to stderr")
+    parser.add_argument("--timings-json", metavar="PATH",
+                        help="write per-phase timings and I/O counts to a JSON file")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="write a cProfile dump of the whole run to PATH")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and update the views as task files change")
+    parser.add_argument("--debounce", type=float, default=1.0, metavar="SECONDS",
+                        help="quiet period before re-rendering in --watch mode (default: 1.0)")
+    args = parser.parse_args()
+
+    timer = PhaseTimer(get_tasks_root(), enabled=args.timings or bool(args.timings_json))
+
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        _, dates, store = profiler.runcall(run, timer)
+        profiler.dump_stats(args.profile)
+    else:
+        _, dates, store = run(timer)
 
-    print("\n=== Done! ===")
+    if args.timings:
+        timer.report()
+    if args.timings_json:
+        timer.write_json(args.timings_json)
+
+    if args.watch:
+        watch_views(store, dates, args.debounce)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Completion history log for task-management plugin.
+
+Every task that gets completed is recorded as one compact JSON line in
+.completion-log.jsonl under tasks_root:
+
+    {"name": ..., "due": ..., "completed": ..., "tags": [...]}
+
+archive-tasks appends entries as it moves tasks, and rollover-recurring
+does the same for each occurrence of a recurring task it closes. Stats
+can then be computed from this one small file without opening any
+markdown. An undone archive run appends {"name": ..., "removed": true}
+entries rather than rewriting the log.
+"""
+
+import json
+
+from config import get_tasks_root
+from fileio import fsync
+
+LOG_FILENAME = ".completion-log.jsonl"
+
+
+def get_log_path():
+    """Return the path of the completion log."""
+    return get_tasks_root() / LOG_FILENAME
+
+
+def entry_for(record):
+    """Return the log entry for a completed task record."""
+    entry = {
+        'name': record['name'],
+        'due': record.get('due') or None,
+        'completed': record.get('completed') or None,
+        'tags': record.get('tags', []),
+    }
+    if record.get('recurrence'):
+        entry['recurrence'] = record['recurrence']
+    return entry
+
+
+def append_entries(entries):
+    """Append entries to the completion log and flush them to disk."""
+    if not entries:
+        return
+    with open(get_log_path(), 'a', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        f.flush()
+        fsync(f.fileno())
+
+
+def record_completed(records):
+    """Append a log entry for each completed task record."""
+    append_entries([entry_for(record) for record in records])
+
+
+def record_removed(names):
+    """Mark tasks as no longer completed (e.g. after an undone archive run)."""
+    append_entries([{'name': name, 'removed': True} for name in names])
+
+
+def read_entries():
+    """
+    Return the log's current entries in the order they were logged.
+
+    A removal drops the most recent entry logged under that name.
+    """
+    entries = []
+    latest = {}
+    try:
+        with open(get_log_path(), encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted write
+                    continue
+                if entry.get('removed'):
+                    index = latest.pop(entry['name'], None)
+                    if index is not None:
+                        entries[index] = None
+                else:
+                    latest[entry['name']] = len(entries)
+                    entries.append(entry)
+    except FileNotFoundError:
+        pass
+    return [entry for entry in entries if entry is not None]
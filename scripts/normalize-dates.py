@@ -8,15 +8,32 @@ Handles multiple input formats:
 - YYYY-MM-DD (already correct)
 
 Converts all to YYYY-MM-DD format.
+
+Use --incremental to skip files that haven't been modified since the
+last successful run. Rewritten files are replaced atomically, as one
+batch.
 """
 
+import argparse
 import re
-import os
-from pathlib import Path
+import time
 from datetime import datetime
 
 # Import config from same directory
-from config import get_all_task_dirs
+from fileio import Splice, read_frontmatter, write_atomic_batch
+from vault import unquote, scan_vault, read_meta, write_meta
+
+TASK_DIR_NAMES = ('tasks', 'ideas', 'bugs', 'import')
+DATE_FIELDS = ('due', 'completed', 'created', 'updated')
+
+# Cache key recording when the last successful normalization started
+LAST_RUN_KEY = 'normalize.last_run_ns'
+
+# A date line whose value is anything other than exactly YYYY-MM-DD
+UNNORMALIZED_DATE_LINE = re.compile(
+    r'^(?:due|completed|created|updated):[ \t]*(?!\d{4}-\d{2}-\d{2}$)\S',
+    re.MULTILINE,
+)
 
 def parse_date(date_str):
     """
@@ -51,28 +68,40 @@ def parse_date(date_str):
     # Return original if we can't parse it
     return date_str
 
-def normalize_file_dates(file_path):
+def has_unnormalized_dates(content):
     """
-    Normalize all date fields in a file's frontmatter.
-    Returns True if file was modified, False otherwise.
+    Fast prefilter: True if any frontmatter date line isn't YYYY-MM-DD.
+
+    Most files are already normalized, so this lets them be rejected with
+    one regex search instead of splitting and rebuilding their content.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    end = content.find('\n---', 3)
+    header = content[:end] if end != -1 else content
+    return UNNORMALIZED_DATE_LINE.search(header) is not None
 
+def normalize_content(content):
+    """
+    Normalize all date fields in a file's frontmatter.
+    Returns the new content, or None if nothing needed changing.
+    """
     # Check if file has frontmatter
     if not content.startswith('---'):
-        return False
+        return None
+
+    if not has_unnormalized_dates(content):
+        return None
 
     # Split content into frontmatter and body
     parts = content.split('---', 2)
     if len(parts) < 3:
-        return False
+        return None
 
     frontmatter = parts[1]
     body = parts[2]
 
-    # Pattern to match date fields (due, completed, created, etc.)
-    date_pattern = r'^(due|completed|created|updated):\s*(.+)$'
+    # Pattern to match date fields (due, completed, created, etc.),
+    # keeping any trailing YAML comment apart from the value
+    date_pattern = r'^(due|completed|created|updated):\s*(.+?)(\s+#.*)?$'
 
     modified = False
     new_lines = []
@@ -82,44 +111,106 @@ def normalize_file_dates(file_path):
         if match:
             field_name = match.group(1)
             date_value = match.group(2)
+            comment = match.group(3) or ''
 
             # Skip empty date values
             if not date_value or date_value.strip() == '':
                 new_lines.append(line)
                 continue
 
-            normalized_date = parse_date(date_value)
+            # Quoted dates are read unquoted, so normalize them unquoted too
+            normalized_date = parse_date(unquote(date_value))
 
             if normalized_date != date_value:
-                new_lines.append(f"{field_name}: {normalized_date}")
+                new_lines.append(f"{field_name}: {normalized_date}{comment}")
                 modified = True
             else:
                 new_lines.append(line)
         else:
             new_lines.append(line)
 
-    if modified:
-        new_frontmatter = '\n'.join(new_lines)
-        new_content = f"---{new_frontmatter}---{body}"
+    if not modified:
+        return None
+
+    new_frontmatter = '\n'.join(new_lines)
+    return f"---{new_frontmatter}---{body}"
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+def normalized_header_rewrite(file_path):
+    """
+    Return a Splice rewriting the file's frontmatter with normalized
+    dates, or None if nothing needs changing. Only the frontmatter is
+    read; the body is copied over byte-for-byte when the file is written.
+    """
+    header, body_offset = read_frontmatter(file_path)
+    new_header = normalize_content(header)
+    if new_header is None:
+        return None
+    return Splice(new_header, body_offset)
+
+def normalize_file_dates(file_path):
+    """
+    Normalize all date fields in a file's frontmatter.
+    Returns True if file was modified, False otherwise.
+    """
+    rewrite = normalized_header_rewrite(file_path)
+    if rewrite is None:
+        return False
 
-        return True
+    write_atomic_batch({file_path: rewrite})
+    return True
 
+def needs_normalization(record):
+    """Return True if any cached date field isn't already YYYY-MM-DD."""
+    for field in DATE_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str) and value and parse_date(value) != value:
+            return True
     return False
 
-def main():
-    """Normalize dates in all task files."""
-    modified_files = []
+def normalize_dates(vault=None, incremental=False):
+    """
+    Normalize dates in all task files.
+
+    Takes an already-scanned vault (folder name -> records) so it can run
+    as a pipeline stage; records that get rewritten are updated in place
+    so later stages see the normalized values. Returns modified paths.
+
+    In incremental mode, files last modified before the previous
+    successful run are skipped outright. This trusts file mtimes, so
+    files copied in with their old mtime preserved won't be checked.
+    """
+    started_ns = time.time_ns()
+    if vault is None:
+        vault = scan_vault(TASK_DIR_NAMES)
 
-    for task_dir in get_all_task_dirs():
-        if not task_dir.exists():
-            continue
+    last_run_ns = read_meta(LAST_RUN_KEY, 0) if incremental else 0
 
-        for file_path in task_dir.glob('*.md'):
-            if normalize_file_dates(file_path):
-                modified_files.append(str(file_path))
+    # Collect every rewrite first so they can be written as one batch
+    rewrites = {}
+    changed_records = []
+
+    for name in TASK_DIR_NAMES:
+        for record in vault.get(name, []):
+            if record.get('mtime_ns', last_run_ns) < last_run_ns:
+                continue
+            # Only files whose indexed dates need fixing are read in full
+            if not needs_normalization(record):
+                continue
+            rewrite = normalized_header_rewrite(record['path'])
+            if rewrite is not None:
+                rewrites[record['path']] = rewrite
+                changed_records.append(record)
+
+    write_atomic_batch(rewrites)
+
+    for record in changed_records:
+        for field in DATE_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str) and value:
+                record[field] = parse_date(value)
+
+    write_meta(LAST_RUN_KEY, started_ns)
+    modified_files = [str(record['path']) for record in changed_records]
 
     # Print results
     if modified_files:
@@ -129,5 +220,15 @@ def main():
     else:
         print("No files needed date normalization.")
 
+    return modified_files
+
+def main():
+    """Normalize dates in all task files."""
+    parser = argparse.ArgumentParser(description="Normalize task dates to YYYY-MM-DD.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="skip files not modified since the last successful run")
+    args = parser.parse_args()
+    normalize_dates(incremental=args.incremental)
+
 if __name__ == '__main__':
     main()
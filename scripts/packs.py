@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Compressed pack files for old completed tasks.
+
+Completed tasks past a configurable age are moved out of completed/ into
+append-only pack files under completed/.packs/, one per completion
+year. Each member is compressed on its own, so any single task can be
+read back with one index lookup, one seek and one decompress, no matter
+how large the pack grows.
+
+Member layout (all integers big-endian):
+
+    b'TPK1' | name length (u16) | data length (u32) | mtime_ns (i64)
+    | name (UTF-8) | zlib-compressed file content
+
+The offset index (.packs/index.sqlite) maps each task name to its pack,
+data offset and length. Packs are self-describing, so the index can be
+rebuilt from them at any time with rebuild_index().
+"""
+
+import os
+import sqlite3
+import struct
+import zlib
+
+from config import get_folder
+from fileio import fsync
+
+PACKS_DIRNAME = ".packs"
+INDEX_FILENAME = "index.sqlite"
+INDEX_VERSION = 1
+
+MAGIC = b'TPK1'
+MEMBER_HEADER = struct.Struct('>4sHIq')
+
+
+def get_packs_dir():
+    """Return the directory holding the pack files."""
+    return get_folder("completed") / PACKS_DIRNAME
+
+
+def pack_path_for(completed):
+    """Return the pack a task completed on `completed` (YYYY-MM-DD) goes to."""
+    year = completed[:4] if completed[:4].isdigit() else "undated"
+    return get_packs_dir() / f"completed-{year}.pack"
+
+
+def open_index(create=True):
+    """
+    Open the pack offset index.
+
+    Returns a sqlite3 connection, or None if there is no index yet and
+    `create` is False (so lookups never create an empty .packs folder).
+    """
+    packs_dir = get_packs_dir()
+    index_path = packs_dir / INDEX_FILENAME
+    if not create and not index_path.exists():
+        return None
+
+    packs_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(index_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+        conn.execute("DROP TABLE IF EXISTS members")
+        conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS members ("
+        " name TEXT PRIMARY KEY,"
+        " pack TEXT NOT NULL,"
+        " offset INTEGER NOT NULL,"
+        " length INTEGER NOT NULL,"
+        " mtime_ns INTEGER NOT NULL)"
+    )
+    return conn
+
+
+def append_members(pack_path, members):
+    """
+    Append (name, content bytes, mtime_ns) members to a pack file.
+
+    The data is flushed to disk before returning. Returns index rows of
+    (name, pack file name, data offset, data length, mtime_ns).
+    """
+    # Drop any torn tail left by an interrupted append, so it can't hide
+    # the members written after it when the index is rebuilt
+    end = 0
+    if pack_path.exists():
+        for _, offset, length, _ in iter_pack(pack_path):
+            end = offset + length
+
+    rows = []
+    with open(pack_path, 'ab') as f:
+        f.truncate(end)
+        offset = f.seek(end)
+        for name, data, mtime_ns in members:
+            name_bytes = name.encode('utf-8')
+            compressed = zlib.compress(data, 9)
+            f.write(MEMBER_HEADER.pack(MAGIC, len(name_bytes), len(compressed), mtime_ns))
+            f.write(name_bytes)
+            f.write(compressed)
+            data_offset = offset + MEMBER_HEADER.size + len(name_bytes)
+            rows.append((name, pack_path.name, data_offset, len(compressed), mtime_ns))
+            offset = data_offset + len(compressed)
+        f.flush()
+        fsync(f.fileno())
+    return rows
+
+
+def read_member(index, name):
+    """Return a packed task's file content as text, or None if not packed."""
+    row = index.execute(
+        "SELECT pack, offset, length FROM members WHERE name = ?", (name,)
+    ).fetchone()
+    if row is None:
+        return None
+    pack, offset, length = row
+    with open(get_packs_dir() / pack, 'rb') as f:
+        f.seek(offset)
+        return zlib.decompress(f.read(length)).decode('utf-8')
+
+
+def _like_escape(text):
+    """Escape SQLite LIKE wildcards so `text` matches literally."""
+    return ''.join(f'\\{c}' if c in '%_\\' else c for c in text)
+
+
+def find_packed(names):
+    """
+    Return {packed name: pack file name} for the given task names and
+    their numbered `name-N` variants already in a pack, so a free name
+    can be chosen when archiving a task whose name was packed before.
+    Names are matched ignoring case (ASCII only, like SQLite's LIKE), as
+    they collide on case-insensitive filesystems.
+    """
+    index = open_index(create=False)
+    if index is None:
+        return {}
+    found = {}
+    for name in names:
+        pattern = _like_escape(name)
+        found.update(index.execute(
+            "SELECT name, pack FROM members"
+            " WHERE name LIKE ? ESCAPE '\\' OR name LIKE ? ESCAPE '\\'",
+            (pattern, f"{pattern}-%"),
+        ))
+    index.close()
+    return found
+
+
+def iter_pack(pack_path):
+    """Yield (name, data offset, data length, mtime_ns) for every member."""
+    with open(pack_path, 'rb') as f:
+        while True:
+            header = f.read(MEMBER_HEADER.size)
+            if len(header) < MEMBER_HEADER.size:
+                return
+            magic, name_len, length, mtime_ns = MEMBER_HEADER.unpack(header)
+            if magic != MAGIC:
+                return
+            name = f.read(name_len).decode('utf-8')
+            offset = f.tell()
+            if f.seek(length, os.SEEK_CUR) > os.fstat(f.fileno()).st_size:
+                # A torn final member from an interrupted append
+                return
+            yield name, offset, length, mtime_ns
+
+
+def rebuild_index():
+    """
+    Rebuild the offset index by reading every pack's member headers.
+
+    When a name appears more than once, the last copy appended wins.
+    Returns the number of members indexed.
+    """
+    index = open_index()
+    index.execute("DELETE FROM members")
+    for pack_path in sorted(get_packs_dir().glob("*.pack")):
+        index.executemany(
+            "INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?)",
+            [(name, pack_path.name, offset, length, mtime_ns)
+             for name, offset, length, mtime_ns in iter_pack(pack_path)],
+        )
+    index.commit()
+    count = index.execute("SELECT COUNT(*) FROM members").fetchone()[0]
+    index.close()
+    return count
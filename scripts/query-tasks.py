@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Query tasks by due-date range.
+
+Examples:
+    python3 query-tasks.py --overdue
+    python3 query-tasks.py --next 90
+    python3 query-tasks.py --from today --to 2025-12-31 --format json
+    python3 query-tasks.py --this-week
+
+--from and --to accept YYYY-MM-DD, "today" or "tomorrow" and are both
+inclusive. Tasks claimed by a today.md section (Research by default, see
+views.sections in config) are excluded unless --include-sections is
+given, matching the daily views. Upcoming occurrences of recurring tasks
+(from today on) are included unless --no-recurring is given.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+
+from config import get_folder, get_view_sections
+from dates import get_week_dates
+from dueindex import is_valid_date
+from formatting import format_date_header, format_link
+from recurrence import project
+from taskstore import TaskStore
+from vault import scan_vault
+
+
+def resolve_date(value, dates):
+    """Turn 'today', 'tomorrow' or YYYY-MM-DD into a YYYY-MM-DD string."""
+    if value in ('today', 'tomorrow'):
+        return dates[value]
+    if not is_valid_date(value):
+        raise argparse.ArgumentTypeError(f"invalid date: {value} (expected YYYY-MM-DD)")
+    return value
+
+
+def resolve_range(args, dates):
+    """Return the (start, end) range selected by the arguments."""
+    if args.overdue:
+        yesterday = datetime.strptime(dates['today'], '%Y-%m-%d') - timedelta(days=1)
+        return None, yesterday.strftime('%Y-%m-%d')
+    if args.this_week:
+        return dates['this_week_start'], dates['this_week_end']
+    if args.next_week:
+        return dates['next_week_start'], dates['next_week_end']
+    if args.next is not None:
+        end = datetime.strptime(dates['today'], '%Y-%m-%d') + timedelta(days=args.next)
+        return dates['today'], end.strftime('%Y-%m-%d')
+
+    start = resolve_date(args.start, dates) if args.start else None
+    end = resolve_date(args.end, dates) if args.end else None
+    return start, end
+
+
+def tasks_by_due_day(store, columns, start, end):
+    """Return {YYYY-MM-DD: task records} for the rows due in [start, end]."""
+    tasks_by_day = {}
+    for row in columns.between(start, end):
+        record = store.fields(columns.row(row))
+        tasks_by_day.setdefault(record['due'], []).append(record)
+    return tasks_by_day
+
+
+def add_projected(tasks_by_day, records, start, end):
+    """
+    Merge upcoming occurrences of the recurring tasks `records` into
+    `tasks_by_day`. Projected entries are (record, True) pairs; real due
+    dates are (record, False). Returns a new dict in date order.
+    """
+    merged = {day: [(r, False) for r in day_records] for day, day_records in tasks_by_day.items()}
+    if end is not None:
+        for day, record in project(records, start, end):
+            merged.setdefault(day, []).append((record, True))
+    return {day: sorted(merged[day], key=lambda e: e[0]['name']) for day in sorted(merged)}
+
+
+def render_markdown(tasks_by_day):
+    """Render matching tasks grouped by day, like the week views."""
+    if not tasks_by_day:
+        return "No tasks in this range.\n"
+
+    content = ""
+    for day_str, records in tasks_by_day.items():
+        day = datetime.strptime(day_str, '%Y-%m-%d')
+        content += f"## {format_date_header(day)}\n"
+        for record, projected in records:
+            suffix = " (recurring)" if projected else ""
+            content += f"- [ ] {format_link(record['name'], 'tasks')}{suffix}\n"
+        content += "\n"
+    return content
+
+
+def render_json(tasks_by_day):
+    """Render matching tasks as a JSON list."""
+    folder = get_folder('tasks')
+    tasks = [
+        {
+            'name': record['name'],
+            'due': record.get('due'),
+            'path': str(folder / f"{record['name']}.md"),
+            'tags': record['tags'],
+            'recurrence': record.get('recurrence'),
+            'occurrence': day,
+            'projected': projected,
+        }
+        for day, records in tasks_by_day.items()
+        for record, projected in records
+    ]
+    return json.dumps(tasks, indent=2) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query tasks by due-date range.")
+    window = parser.add_mutually_exclusive_group()
+    window.add_argument("--overdue", action="store_true", help="tasks due before today")
+    window.add_argument("--this-week", action="store_true", help="tasks due this week")
+    window.add_argument("--next-week", action="store_true", help="tasks due next week")
+    window.add_argument("--next", type=int, metavar="DAYS", help="tasks due from today through DAYS days ahead")
+    parser.add_argument("--from", dest="start", metavar="DATE", help="first due date (inclusive)")
+    parser.add_argument("--to", dest="end", metavar="DATE", help="last due date (inclusive)")
+    parser.add_argument("--format", choices=("markdown", "json"), default="markdown")
+    parser.add_argument("--include-sections", "--include-research", action="store_true",
+                        help="include tasks claimed by today.md sections (e.g. Research)")
+    parser.add_argument("--no-recurring", action="store_true",
+                        help="don't project upcoming occurrences of recurring tasks")
+    args = parser.parse_args()
+
+    dates = get_week_dates()
+    try:
+        start, end = resolve_range(args, dates)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    store = TaskStore(scan_vault(['tasks']), ('tasks',))
+    columns = store.due_columns(() if args.include_sections else get_view_sections())
+
+    tasks_by_day = tasks_by_due_day(store, columns, start, end)
+    if args.no_recurring:
+        tasks_by_day = {day: [(r, False) for r in rs] for day, rs in tasks_by_day.items()}
+    else:
+        # Only project occurrences from today on, never into the past
+        projection_start = max(start or dates['today'], dates['today'])
+        recurring = [store.fields(columns.row(row)) for row in columns.recurring()]
+        tasks_by_day = add_projected(tasks_by_day, recurring, projection_start, end)
+
+    if args.format == "json":
+        sys.stdout.write(render_json(tasks_by_day))
+    else:
+        sys.stdout.write(render_markdown(tasks_by_day))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Recurrence expansion for task-management plugin.
+
+Projects recurring tasks (`recurrence:` plus optional `recurrence_day:`)
+onto any date window, following the rules in the manage-tasks skill:
+
+- weekly / biweekly: every 7 / 14 days from the current due date
+- monthly / quarterly: every 1 / 3 months, on recurrence_day (or the due
+  date's day), clamped to the end of shorter months
+- yearly: the same month and day every year (Feb 29 becomes Feb 28)
+
+Occurrence calendars are computed once per (rule, anchor, day) and
+cached, so many tasks sharing a schedule cost a single expansion and
+each window lookup is a binary search.
+"""
+
+import calendar
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+DAY_STEPS = {'weekly': 7, 'biweekly': 14}
+MONTH_STEPS = {'monthly': 1, 'quarterly': 3, 'yearly': 12}
+RULES = tuple(DAY_STEPS) + tuple(MONTH_STEPS)
+
+
+def _parse(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _add_months(anchor, months, day):
+    """Return `anchor` moved by `months`, on `day` clamped to month end."""
+    month_index = anchor.month - 1 + months
+    year = anchor.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+@lru_cache(maxsize=4096)
+def occurrence_calendar(rule, anchor_ordinal, day, until_ordinal):
+    """
+    Return ordinals of every occurrence from the anchor through `until`.
+
+    The anchor (the task's current due date) is always the first entry.
+    """
+    anchor = date.fromordinal(anchor_ordinal)
+    ordinals = [anchor_ordinal]
+
+    if rule in DAY_STEPS:
+        step = DAY_STEPS[rule]
+        ordinals.extend(range(anchor_ordinal + step, until_ordinal + 1, step))
+        return tuple(ordinals)
+
+    step = MONTH_STEPS[rule]
+    i = 1
+    while True:
+        ordinal = _add_months(anchor, step * i, day).toordinal()
+        if ordinal > until_ordinal:
+            return tuple(ordinals)
+        ordinals.append(ordinal)
+        i += 1
+
+
+def _schedule(record):
+    """Return (rule, anchor date, day) for a recurring record, or None."""
+    rule = str(record.get('recurrence') or '').strip().lower()
+    if rule not in RULES:
+        return None
+    try:
+        anchor = _parse(record.get('due') or '')
+    except ValueError:
+        return None
+
+    day = anchor.day
+    if rule in ('monthly', 'quarterly'):
+        try:
+            day = int(record.get('recurrence_day') or anchor.day)
+        except (TypeError, ValueError):
+            pass
+    day = max(1, min(day, 31))
+    return rule, anchor, day
+
+
+def occurrences(record, start, end):
+    """
+    Return YYYY-MM-DD strings of a recurring task's occurrences within
+    [start, end] (inclusive). Non-recurring records return [].
+    """
+    schedule = _schedule(record)
+    if schedule is None:
+        return []
+    rule, anchor, day = schedule
+
+    start_ordinal = _parse(start).toordinal()
+    end_date = _parse(end)
+    # Round the horizon up to year end so nearby windows share a calendar
+    until = date(end_date.year, 12, 31).toordinal()
+
+    ordinals = occurrence_calendar(rule, anchor.toordinal(), day, until)
+    lo = bisect_left(ordinals, start_ordinal)
+    hi = bisect_right(ordinals, end_date.toordinal())
+    return [date.fromordinal(o).isoformat() for o in ordinals[lo:hi]]
+
+
+def next_occurrence(record):
+    """Return the occurrence after the task's current due date, or None."""
+    schedule = _schedule(record)
+    if schedule is None:
+        return None
+    rule, anchor, day = schedule
+    if rule in DAY_STEPS:
+        return (anchor + timedelta(days=DAY_STEPS[rule])).isoformat()
+    return _add_months(anchor, MONTH_STEPS[rule], day).isoformat()
+
+
+def project(records, start, end):
+    """
+    Yield (date string, record) for upcoming occurrences of recurring
+    tasks within [start, end], excluding each task's current due date
+    (which already shows up as a normal due task).
+    """
+    for record in records:
+        for occurrence in occurrences(record, start, end):
+            if occurrence != record.get('due'):
+                yield occurrence, record
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Roll completed recurring tasks over to their next due date.
+
+For every task in tasks/ with both a recurrence: rule and a completed:
+date, in a single pass:
+1. Computes the next due date from recurrence / recurrence_day (skipping
+   ahead past any occurrences missed before the completion date)
+2. Adds "- <completed>: Completed" to the top of the ## History section
+   (creating the section if needed)
+3. Updates due: and removes completed:
+4. Appends the completed occurrence to the completion log (history.py)
+
+All changed files are written atomically as one batch, keeping their
+line endings. Use --dry-run to see what would change without touching
+disk.
+"""
+
+import argparse
+import re
+
+import history
+from dueindex import is_valid_date
+from fileio import read_text_newline, write_atomic_batch
+from recurrence import next_occurrence
+from vault import scan_vault
+
+HISTORY_HEADING = re.compile(r'^## History[ \t]*$', re.MULTILINE)
+
+
+def next_due_after(record, completed):
+    """Return the first occurrence after both the current due and `completed`."""
+    due = record.get('due')
+    while True:
+        due = next_occurrence(dict(record, due=due))
+        if due is None or due > completed:
+            return due
+
+
+def rollover_content(content, next_due, completed):
+    """Return the file content rolled over to `next_due`."""
+    lines = content.split('\n')
+    # lines[0] is the opening ---; find the closing one
+    end = next(i for i in range(1, len(lines)) if lines[i].strip() == '---')
+
+    header = []
+    for line in lines[1:end]:
+        if line.startswith('completed:'):
+            continue
+        if line.startswith('due:'):
+            line = f"due: {next_due}"
+        header.append(line)
+
+    body = '\n'.join(lines[end + 1:])
+    entry = f"- {completed}: Completed"
+    match = HISTORY_HEADING.search(body)
+    if match:
+        body = body[:match.end()] + '\n' + entry + body[match.end():]
+    else:
+        body = body.rstrip('\n') + f"\n\n## History\n{entry}\n"
+
+    return '\n'.join(['---'] + header + ['---']) + '\n' + body
+
+
+def rollover_recurring_tasks(records=None, dry_run=False):
+    """
+    Roll over every completed recurring task.
+
+    Takes already-parsed tasks/ records when run as a pipeline stage.
+    Returns a list of (record, completed, next due) for each task rolled over.
+    """
+    if records is None:
+        records = scan_vault(['tasks'])['tasks']
+
+    rewrites = {}
+    rolled = []
+    problems = []
+
+    for record in records:
+        completed = record.get('completed')
+        if not record.get('recurrence') or not isinstance(completed, str) or not completed:
+            continue
+
+        next_due = next_due_after(record, completed) if is_valid_date(completed) else None
+        if next_due is None:
+            problems.append(record)
+            continue
+
+        try:
+            content, newline = read_text_newline(record['path'])
+            content = rollover_content(content, next_due, completed)
+        except StopIteration:
+            problems.append(record)
+            continue
+        # Keep the file's own line endings (e.g. CRLF from Windows editors)
+        rewrites[record['path']] = content.replace('\n', newline)
+        rolled.append((record, completed, next_due))
+
+    if not dry_run:
+        write_atomic_batch(rewrites)
+        history.record_completed([record for record, _, _ in rolled])
+        for record, _, next_due in rolled:
+            record['due'] = next_due
+            del record['completed']
+
+    # Report results
+    if rolled:
+        verb = "Would roll over" if dry_run else "Rolled over"
+        print(f"{verb} {len(rolled)} recurring task(s):\n")
+        for record, completed, next_due in rolled:
+            print(f"  - {record['path'].name}: completed {completed}, next due {next_due}")
+    else:
+        print("No completed recurring tasks to roll over.")
+
+    if problems:
+        print(f"\nSkipped {len(problems)} task(s) with an unknown recurrence rule or invalid date:")
+        for record in problems:
+            print(f"  - {record['path'].name}")
+
+    return rolled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll completed recurring tasks over to their next due date.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what would change without touching disk")
+    args = parser.parse_args()
+
+    print("=== Rolling Over Recurring Tasks ===\n")
+    rollover_recurring_tasks(dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
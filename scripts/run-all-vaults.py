@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Run the daily pipeline for every configured vault in parallel.
+
+Each vault listed under paths.vaults in config.yaml gets the full
+generate-daily-files pipeline (normalize, archive, views) in its own
+worker process, so a failure or slow sync folder in one vault never
+affects another. Each vault's output is printed as its own block, in
+config order, followed by a one-line status per vault. The exit status
+is non-zero if any vault failed.
+
+Examples:
+    python3 run-all-vaults.py
+    python3 run-all-vaults.py --vaults work,personal --workers 2
+    python3 run-all-vaults.py --combined-today ~/Tasks/today-all.md
+
+--combined-today also writes one file merging every vault's Overdue and
+Due Today sections, grouped by vault.
+"""
+
+import argparse
+import importlib
+import io
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+from config import get_vaults, select_vault
+from fileio import write_if_changed
+from formatting import format_date_header, format_link
+from timings import PhaseTimer
+
+
+def run_vault(name):
+    """
+    Run the pipeline for one vault in this (worker) process.
+
+    Returns a summary dict with the vault's captured output, its status
+    (0 or 1) and its overdue and due-today tasks for the combined view.
+    """
+    output = io.StringIO()
+    summary = {'vault': name, 'status': 0, 'overdue': [], 'due_today': [], 'today': None}
+    with redirect_stdout(output):
+        try:
+            select_vault(name)
+            views = importlib.import_module("generate-daily-files")
+            _, dates, store = views.run(PhaseTimer(enabled=False))
+
+            due_index = views.build_due_index(store)
+            summary['today'] = dates['today']
+            summary['overdue'] = views.get_overdue_tasks(due_index, dates['today'])
+            summary['due_today'] = views.get_tasks_for_date(due_index, dates['today'])
+        except Exception:
+            traceback.print_exc(file=output)
+            summary['status'] = 1
+    summary['output'] = output.getvalue()
+    return summary
+
+
+def render_combined_today(summaries):
+    """Render one today view merging every vault's overdue and due-today tasks."""
+    today = next(s['today'] for s in summaries if s['today'])
+
+    content = f"---\ndate: {today}\n---\n"
+    content += f"# Today - {format_date_header(datetime.strptime(today, '%Y-%m-%d'))}\n\n"
+
+    content += "## Overdue\n"
+    for summary in summaries:
+        if summary['overdue']:
+            content += f"### {summary['vault']}\n"
+            for filename, due_date in summary['overdue']:
+                content += f"- [ ] {format_link(filename, 'tasks')} (due: {due_date})\n"
+    content += "\n"
+
+    content += "## Due Today\n"
+    for summary in summaries:
+        if summary['due_today']:
+            content += f"### {summary['vault']}\n"
+            for filename in summary['due_today']:
+                content += f"- [ ] {format_link(filename, 'tasks')}\n"
+    content += "\n"
+    return content
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the daily pipeline for every configured vault.")
+    parser.add_argument("--vaults", metavar="NAMES",
+                        help="comma-separated vault names to run (default: all)")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="worker processes (default: one per vault)")
+    parser.add_argument("--combined-today", metavar="PATH",
+                        help="also write a today view merging every vault's overdue and due-today tasks")
+    args = parser.parse_args()
+
+    vaults = list(get_vaults())
+    if args.vaults:
+        selected = [name.strip() for name in args.vaults.split(',') if name.strip()]
+        unknown = [name for name in selected if name not in vaults]
+        if unknown:
+            parser.error(f"unknown vault(s): {', '.join(unknown)} (configured: {', '.join(vaults)})")
+        vaults = selected
+
+    workers = max(1, min(args.workers or len(vaults), len(vaults)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = list(pool.map(run_vault, vaults))
+
+    for summary in summaries:
+        print(f"##### Vault: {summary['vault']} #####\n")
+        print(summary['output'])
+
+    print("=== Vault Summary ===")
+    for summary in summaries:
+        if summary['status']:
+            print(f"  {summary['vault']}: FAILED")
+        else:
+            print(f"  {summary['vault']}: ok ({len(summary['overdue'])} overdue, "
+                  f"{len(summary['due_today'])} due today)")
+
+    succeeded = [s for s in summaries if not s['status']]
+    if args.combined_today and succeeded:
+        path = Path(args.combined_today).expanduser()
+        changed = write_if_changed(path, render_combined_today(succeeded))
+        print(f"\n{'Updated' if changed else 'Unchanged'}: {path}")
+
+    sys.exit(1 if len(succeeded) < len(summaries) else 0)
+
+
+if __name__ == "__main__":
+    main()
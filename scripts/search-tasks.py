@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Search task, idea, memory, bug, import and completed files.
+
+Examples:
+    python3 search-tasks.py flea medicine
+    python3 search-tasks.py grooming --folder tasks --folder completed
+    python3 search-tasks.py --tag research-review --from 2025-01-01
+    python3 search-tasks.py "quarterly plan" --type idea --format json
+
+Words are matched against file names, titles (the first `# ` heading),
+tags and bodies; every word must match, and each also matches as a
+prefix. Hits are ranked with file names and titles weighted above tags
+and bodies. The index is updated for changed files before every search.
+--from and --to filter on a file's due date, else its completed or
+created date.
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+
+from dueindex import is_valid_date
+from formatting import format_link
+from searchindex import SEARCH_FOLDERS, open_index, search, update_index
+
+
+def valid_date(value):
+    if not is_valid_date(value):
+        raise argparse.ArgumentTypeError(f"invalid date: {value} (expected YYYY-MM-DD)")
+    return value
+
+
+def render_markdown(hits):
+    """Render hits as a numbered list with their snippets."""
+    if not hits:
+        return "No matches.\n"
+
+    content = ""
+    for i, hit in enumerate(hits, 1):
+        details = [hit['folder']]
+        if hit['date']:
+            details.append(hit['date'])
+        if hit['tags']:
+            details.append(', '.join(hit['tags']))
+        content += f"{i}. {format_link(hit['name'], hit['folder'])} ({'; '.join(details)})\n"
+        if hit['snippet']:
+            content += f"   {hit['snippet']}\n"
+    return content
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over the vault.")
+    parser.add_argument("words", nargs="*", help="words to search for")
+    parser.add_argument("--folder", action="append", choices=SEARCH_FOLDERS,
+                        help="only search this folder (repeatable)")
+    parser.add_argument("--type", dest="doc_type", help="only files with this type: value")
+    parser.add_argument("--tag", action="append", help="only files with this tag (repeatable)")
+    parser.add_argument("--from", dest="start", type=valid_date, metavar="DATE",
+                        help="first date (inclusive)")
+    parser.add_argument("--to", dest="end", type=valid_date, metavar="DATE",
+                        help="last date (inclusive)")
+    parser.add_argument("--limit", type=int, default=20, help="maximum hits (default 20)")
+    parser.add_argument("--raw", action="store_true",
+                        help="pass the words through as an SQLite FTS5 query")
+    parser.add_argument("--format", choices=("markdown", "json"), default="markdown")
+    args = parser.parse_args()
+
+    conn = open_index()
+    if conn is None:
+        sys.exit("search-tasks: can't open the search index "
+                 "(read-only or locked vault, or SQLite built without FTS5)")
+    try:
+        try:
+            update_index(conn)
+        except sqlite3.Error as e:
+            # Still search what's already indexed, e.g. on a read-only vault
+            conn.rollback()
+            print(f"Warning: couldn't update the search index ({e}); "
+                  "results may be out of date.", file=sys.stderr)
+        try:
+            hits = search(
+                conn, ' '.join(args.words), folders=args.folder, doc_type=args.doc_type,
+                tags=args.tag, start=args.start, end=args.end, limit=args.limit, raw=args.raw,
+            )
+        except sqlite3.OperationalError as e:
+            if 'locked' in str(e):
+                sys.exit(f"search-tasks: the search index is locked ({e}); try again shortly")
+            parser.error(f"invalid search query: {e}")
+    finally:
+        conn.close()
+
+    if args.format == "json":
+        sys.stdout.write(json.dumps(hits, indent=2) + "\n")
+    else:
+        sys.stdout.write(render_markdown(hits))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Full-text search index for task-management plugin.
+
+Titles, tags and bodies of every file in the searchable folders are kept
+in a SQLite FTS5 index (.search-index.sqlite under tasks_root). Like the
+frontmatter cache, entries are keyed by path plus mtime and size, so an
+update only reads files that changed since the last search and drops
+files that were deleted or moved.
+
+Each document also keeps its folder, type, tags and a date (due, else
+completed, else created) so results can be filtered without touching
+the files. Dates are stored as YYYY-MM-DD whatever their format in the
+file (completed/ and memories/ are never normalized), so date ranges
+and ordering compare correctly.
+"""
+
+import importlib
+import json
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from config import get_tasks_root, get_folder, get_scan_workers
+from dueindex import is_valid_date
+from fileio import read_text
+from vault import list_markdown_files, split_frontmatter
+
+INDEX_FILENAME = ".search-index.sqlite"
+INDEX_VERSION = 2
+
+SEARCH_FOLDERS = ('tasks', 'ideas', 'memories', 'bugs', 'completed', 'import')
+
+# bm25 column weights: name, title, tags, body
+RANK_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+
+TITLE_PATTERN = re.compile(r'^#[ \t]+(.+?)[ \t]*$', re.MULTILINE)
+TERM_PATTERN = re.compile(r'[^\s"]+')
+
+# Date parsing is shared with the normalize stage
+normalize_stage = importlib.import_module("normalize-dates")
+
+
+def open_index(root=None):
+    """
+    Open (creating if needed) the search index under tasks_root.
+
+    Returns a sqlite3 connection, or None if the index can't be used
+    (e.g. a read-only vault without an index yet, a locked index, or an
+    SQLite build without FTS5).
+    """
+    path = Path(root or get_tasks_root()) / INDEX_FILENAME
+    try:
+        conn = sqlite3.connect(path)
+    except sqlite3.Error:
+        return None
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            conn.execute("DROP TABLE IF EXISTS docs")
+            conn.execute("DROP TABLE IF EXISTS doc_tags")
+            conn.execute("DROP TABLE IF EXISTS fts")
+            conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " id INTEGER PRIMARY KEY,"
+            " path TEXT UNIQUE NOT NULL,"
+            " folder TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " type TEXT,"
+            " date TEXT,"
+            " tags TEXT NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS doc_tags (tag TEXT NOT NULL, id INTEGER NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS doc_tags_tag ON doc_tags (tag)")
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5("
+            "name, title, tags, body, tokenize='porter unicode61')"
+        )
+        return conn
+    except sqlite3.Error:
+        conn.close()
+        return None
+
+
+def parse_document(path):
+    """Read a file into its frontmatter fields, title and body text."""
+    try:
+        content = read_text(path)
+    except (OSError, UnicodeDecodeError):
+        content = ''
+
+    fields, body = split_frontmatter(content)
+
+    title = TITLE_PATTERN.search(body)
+    tags = fields.get('tags', [])
+    if isinstance(tags, str):
+        tags = [tags] if tags else []
+
+    date = next((fields[k] for k in ('due', 'completed', 'created') if fields.get(k)), None)
+    if isinstance(date, str):
+        date = normalize_stage.parse_date(date)
+    return {
+        'type': fields.get('type') or None,
+        'date': date if is_valid_date(date) else None,
+        'tags': tags,
+        'title': title.group(1) if title else '',
+        'body': body,
+    }
+
+
+def _remove(conn, doc_ids):
+    conn.executemany("DELETE FROM fts WHERE rowid = ?", [(i,) for i in doc_ids])
+    conn.executemany("DELETE FROM doc_tags WHERE id = ?", [(i,) for i in doc_ids])
+    conn.executemany("DELETE FROM docs WHERE id = ?", [(i,) for i in doc_ids])
+
+
+def update_index(conn, folders=SEARCH_FOLDERS, workers=None):
+    """
+    Bring the index up to date with the files on disk.
+
+    Only new or changed files (by mtime and size) are read, in parallel;
+    entries for files that disappeared are dropped. Returns the number
+    of files (re)indexed.
+    """
+    known = {
+        row[0]: row[1:]
+        for row in conn.execute("SELECT path, id, mtime_ns, size FROM docs")
+    }
+
+    changed = []
+    for name in folders:
+        folder = get_folder(name)
+        try:
+            entries = list_markdown_files(folder)
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            path = str(folder / entry.name)
+            hit = known.pop(path, None)
+            if hit and hit[1] == st.st_mtime_ns and hit[2] == st.st_size:
+                continue
+            changed.append((path, name, st, hit[0] if hit else None))
+
+    # Anything left in `known` was deleted or moved since the last update
+    stale = [doc_id for doc_id, _, _ in known.values()]
+    stale += [doc_id for _, _, _, doc_id in changed if doc_id is not None]
+    _remove(conn, stale)
+
+    if workers is None:
+        workers = get_scan_workers()
+    paths = [path for path, _, _, _ in changed]
+    if workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            docs = list(pool.map(parse_document, paths))
+    else:
+        docs = [parse_document(path) for path in paths]
+
+    for (path, folder, st, _), doc in zip(changed, docs):
+        name = Path(path).stem
+        cursor = conn.execute(
+            "INSERT INTO docs (path, folder, name, type, date, tags, mtime_ns, size)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, folder, name, doc['type'], doc['date'], json.dumps(doc['tags']),
+             st.st_mtime_ns, st.st_size),
+        )
+        doc_id = cursor.lastrowid
+        conn.executemany("INSERT INTO doc_tags VALUES (?, ?)", [(tag, doc_id) for tag in doc['tags']])
+        conn.execute(
+            "INSERT INTO fts (rowid, name, title, tags, body) VALUES (?, ?, ?, ?, ?)",
+            (doc_id, name.replace('-', ' '), doc['title'], ' '.join(doc['tags']), doc['body']),
+        )
+
+    conn.commit()
+    return len(changed)
+
+
+def to_match_query(text):
+    """Turn plain search words into an FTS5 query: every term, as a prefix."""
+    return ' '.join(f'"{term}"*' for term in TERM_PATTERN.findall(text))
+
+
+def search(conn, text=None, folders=None, doc_type=None, tags=None,
+           start=None, end=None, limit=20, raw=False):
+    """
+    Return ranked hits for `text` (all terms must match), best first.
+
+    Without `text`, every document passing the filters is returned,
+    most recent date first. `tags` must all be present; `start` / `end`
+    bound the document date inclusively. Each hit is a dict with path,
+    folder, name, type, date, tags and (for text searches) a snippet.
+    """
+    where = []
+    params = []
+    if folders:
+        where.append(f"d.folder IN ({', '.join('?' * len(folders))})")
+        params.extend(folders)
+    if doc_type:
+        where.append("d.type = ?")
+        params.append(doc_type)
+    for tag in tags or ():
+        where.append("d.id IN (SELECT id FROM doc_tags WHERE tag = ?)")
+        params.append(tag)
+    if start:
+        where.append("d.date >= ?")
+        params.append(start)
+    if end:
+        where.append("d.date <= ?")
+        params.append(end)
+
+    query = text if raw else to_match_query(text or '')
+    if query:
+        sql = (
+            "SELECT d.path, d.folder, d.name, d.type, d.date, d.tags,"
+            " snippet(fts, 3, '**', '**', '…', 12)"
+            " FROM fts JOIN docs d ON d.id = fts.rowid"
+            " WHERE fts MATCH ?"
+        )
+        params.insert(0, query)
+        order = f"bm25(fts, {', '.join(str(w) for w in RANK_WEIGHTS)})"
+    else:
+        sql = "SELECT d.path, d.folder, d.name, d.type, d.date, d.tags, NULL FROM docs d WHERE 1"
+        order = "d.date IS NULL, d.date DESC, d.name"
+
+    sql += ''.join(f" AND {clause}" for clause in where)
+    sql += f" ORDER BY {order} LIMIT ?"
+    params.append(limit)
+
+    return [
+        {
+            'path': path,
+            'folder': folder,
+            'name': name,
+            'type': kind,
+            'date': date,
+            'tags': json.loads(tags_json),
+            # Only show body snippets that actually contain a match
+            'snippet': ' '.join(snippet.split()) if snippet and '**' in snippet else None,
+        }
+        for path, folder, name, kind, date, tags_json, snippet in conn.execute(sql, params)
+    ]
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Tag rules for task-management plugin.
+
+Today-view sections such as "## Research" are defined by tag rules in
+config.yaml (see config.get_view_sections()). Tasks claimed by a section
+are listed under it in today.md and left out of the due-date lists.
+
+The views sort a whole vault into sections with TaskStore.sections()
+(see taskstore.py); this module checks single records against the rules.
+"""
+
+
+def matches_any(record, rules):
+    """Return True if a single record belongs to any section."""
+    tags = set(record['tags'])
+    return any(tags & rule['include'] and not tags & rule['exclude'] for rule in rules)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Completion statistics from the completion history log.
+
+Reports weekly throughput, how late tasks were when they were closed and
+a per-tag breakdown, all from .completion-log.jsonl (see history.py)
+without opening any markdown files.
+
+Examples:
+    python3 task-stats.py
+    python3 task-stats.py --weeks 26 --format json
+    python3 task-stats.py --backfill
+
+--backfill is a one-time import of tasks archived before the log
+existed: it adds an entry for every file in completed/ (and every packed
+task) that isn't logged yet.
+"""
+
+import argparse
+import json
+import sys
+from datetime import date, timedelta
+from statistics import median
+
+import history
+import packs
+from dueindex import is_valid_date
+from vault import parse_frontmatter, scan_vault
+
+# (label, lowest days late, highest days late) for the lateness histogram
+LATENESS_BUCKETS = (
+    ("early", None, -1),
+    ("on time", 0, 0),
+    ("1-3 days late", 1, 3),
+    ("4-7 days late", 4, 7),
+    ("8-30 days late", 8, 30),
+    ("31+ days late", 31, None),
+)
+
+
+def backfill():
+    """Log every completed task that isn't in the log yet. Returns the count."""
+    logged = {entry['name'] for entry in history.read_entries()}
+    records = [r for r in scan_vault(['completed'])['completed'] if r['name'] not in logged]
+
+    index = packs.open_index(create=False)
+    if index is not None:
+        names = [row[0] for row in index.execute("SELECT name FROM members ORDER BY name")]
+        for name in names:
+            if name in logged:
+                continue
+            record = parse_frontmatter(packs.read_member(index, name))
+            tags = record.get('tags', [])
+            record['tags'] = [tags] if isinstance(tags, str) and tags else tags or []
+            record['name'] = name
+            records.append(record)
+        index.close()
+
+    records.sort(key=lambda r: (str(r.get('completed') or ''), r['name']))
+    history.record_completed(records)
+    return len(records)
+
+
+def days_late(entry):
+    """Return completed minus due in days, or None if either is missing."""
+    due, completed = entry.get('due'), entry.get('completed')
+    if not is_valid_date(due) or not is_valid_date(completed):
+        return None
+    return date.fromisoformat(completed).toordinal() - date.fromisoformat(due).toordinal()
+
+
+def bucket_for(late):
+    """Return the lateness bucket label for a number of days late."""
+    for label, low, high in LATENESS_BUCKETS:
+        if (low is None or late >= low) and (high is None or late <= high):
+            return label
+    return None
+
+
+def compute_stats(entries, weeks, today=None):
+    """Compute throughput, lateness and tag statistics from log entries."""
+    today = today or date.today()
+    this_monday = today - timedelta(days=today.weekday())
+    week_starts = [(this_monday - timedelta(weeks=i)).isoformat() for i in range(weeks - 1, -1, -1)]
+    throughput = dict.fromkeys(week_starts, 0)
+
+    lateness = dict.fromkeys([label for label, _, _ in LATENESS_BUCKETS] + ["missing due or completed date"], 0)
+    tag_lateness = {}
+    all_late = []
+
+    for entry in entries:
+        completed = entry.get('completed')
+        if is_valid_date(completed):
+            day = date.fromisoformat(completed)
+            week = (day - timedelta(days=day.weekday())).isoformat()
+            if week in throughput:
+                throughput[week] += 1
+
+        late = days_late(entry)
+        if late is None:
+            lateness["missing due or completed date"] += 1
+        else:
+            lateness[bucket_for(late)] += 1
+            all_late.append(late)
+
+        for tag in entry.get('tags') or ['(untagged)']:
+            tag_lateness.setdefault(tag, []).append(late)
+
+    tags = []
+    for tag, lates in tag_lateness.items():
+        known = [late for late in lates if late is not None]
+        tags.append({
+            'tag': tag,
+            'completed': len(lates),
+            'median_days_late': median(known) if known else None,
+        })
+    tags.sort(key=lambda t: (-t['completed'], t['tag']))
+
+    return {
+        'total': len(entries),
+        'median_days_late': median(all_late) if all_late else None,
+        'weekly_throughput': throughput,
+        'lateness': lateness,
+        'tags': tags,
+    }
+
+
+def render_markdown(stats, top_tags):
+    """Render stats as markdown tables."""
+    lines = ["# Completion Stats", "", f"Tasks completed: {stats['total']}"]
+    if stats['median_days_late'] is not None:
+        lines.append(f"Median days late: {stats['median_days_late']:g}")
+
+    lines += ["", "## Weekly Throughput", "", "| Week of | Completed |", "|---|---|"]
+    lines += [f"| {week} | {count} |" for week, count in stats['weekly_throughput'].items()]
+
+    lines += ["", "## Lateness", "", "| When closed | Tasks |", "|---|---|"]
+    lines += [f"| {label} | {count} |" for label, count in stats['lateness'].items()]
+
+    lines += ["", "## Tags", "", "| Tag | Completed | Median days late |", "|---|---|---|"]
+    for tag in stats['tags'][:top_tags]:
+        late = "-" if tag['median_days_late'] is None else f"{tag['median_days_late']:g}"
+        lines.append(f"| {tag['tag']} | {tag['completed']} | {late} |")
+
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Completion statistics from the completion log.")
+    parser.add_argument("--backfill", action="store_true",
+                        help="log completed/ tasks that predate the completion log")
+    parser.add_argument("--weeks", type=int, default=12,
+                        help="number of weeks of throughput to show (default 12)")
+    parser.add_argument("--tags", type=int, default=15, metavar="N",
+                        help="number of tags to show (default 15)")
+    parser.add_argument("--format", choices=("markdown", "json"), default="markdown")
+    args = parser.parse_args()
+
+    if args.backfill:
+        print(f"Backfilled {backfill()} completed task(s) into the completion log.\n")
+
+    stats = compute_stats(history.read_entries(), max(1, args.weeks))
+    if args.format == "json":
+        sys.stdout.write(json.dumps(stats, indent=2) + "\n")
+    else:
+        sys.stdout.write(render_markdown(stats, args.tags))
+
+
+if __name__ == "__main__":
+    main()
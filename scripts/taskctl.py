@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the task-management scripts.
+
+Runs one or more subcommands in a single interpreter, so a sequence of
+commands pays for startup, imports and config loading once, and shares
+one scan of the vault:
+
+    python3 taskctl.py today
+    python3 taskctl.py normalize archive this-week next-week
+    python3 taskctl.py clean-imports today
+    python3 taskctl.py archive --dry-run weeks
+
+Options following a subcommand apply to that subcommand. Modules are
+only imported once a subcommand that needs them runs, so `weeks` never
+loads the vault scanner and nothing imports yaml unless config.yaml has
+changed since its JSON sidecar was written.
+"""
+
+import importlib
+import sys
+
+NORMALIZE_MODULE = "normalize-dates"
+ARCHIVE_MODULE = "archive-tasks"
+VIEWS_MODULE = "generate-daily-files"
+
+
+class Context:
+    """State shared by the subcommands of one invocation."""
+
+    def __init__(self):
+        self._vault = None
+        self._dates = None
+
+    @property
+    def vault(self):
+        """The scanned vault, scanned on first use."""
+        if self._vault is None:
+            normalize_stage = importlib.import_module(NORMALIZE_MODULE)
+            from vault import scan_vault
+            self._vault = scan_vault(normalize_stage.TASK_DIR_NAMES)
+        return self._vault
+
+    @property
+    def dates(self):
+        if self._dates is None:
+            from dates import get_week_dates
+            self._dates = get_week_dates()
+        return self._dates
+
+    def use(self, vault, dates):
+        """Adopt a vault and dates produced by a full pipeline run."""
+        self._vault = vault
+        self._dates = dates
+
+    def invalidate(self):
+        """Forget the scanned vault after files were moved behind its back."""
+        self._vault = None
+
+
+def parse_options(name, argv, options):
+    """
+    Parse a subcommand's options; `options` is a list of (flag, help) for
+    mutually exclusive switches, or (flag, help, choices) for an option
+    taking one of `choices` (None when not given).
+    """
+    if not argv:
+        return {option[0].lstrip('-').replace('-', '_'): None if len(option) > 2 else False
+                for option in options}
+    import argparse
+    parser = argparse.ArgumentParser(prog=f"taskctl {name}")
+    group = parser.add_mutually_exclusive_group()
+    for flag, help_text, *choices in options:
+        if choices:
+            parser.add_argument(flag, choices=choices[0], help=help_text)
+        else:
+            group.add_argument(flag, action="store_true", help=help_text)
+    return vars(parser.parse_args(argv))
+
+
+def cmd_today(ctx, argv):
+    parse_options("today", argv, [])
+    from timings import PhaseTimer
+    views = importlib.import_module(VIEWS_MODULE)
+    vault, dates, _ = views.run(PhaseTimer(enabled=False), ctx.vault)
+    ctx.use(vault, dates)
+
+
+def _generate_view(view, ctx, argv):
+    parse_options(view, argv, [])
+    views = importlib.import_module(VIEWS_MODULE)
+    changed = views.VIEW_GENERATORS[view](ctx.dates, views.build_store(ctx.vault))
+    print(f"Updated {view}.md" if changed else f"{view}.md already up to date.")
+
+
+def cmd_this_week(ctx, argv):
+    _generate_view("this-week", ctx, argv)
+
+
+def cmd_next_week(ctx, argv):
+    _generate_view("next-week", ctx, argv)
+
+
+def cmd_archive(ctx, argv):
+    args = parse_options("archive", argv, [
+        ("--dry-run", "report what would move without touching disk"),
+        ("--resume", "finish an interrupted archive run"),
+        ("--undo", "move the last archive run's files back to tasks/"),
+    ])
+    archive_stage = importlib.import_module(ARCHIVE_MODULE)
+    print("=== Archiving Completed Tasks ===\n")
+    if args['resume'] or args['undo']:
+        if args['resume']:
+            archive_stage.resume_archive()
+        else:
+            archive_stage.undo_archive()
+        ctx.invalidate()
+        return
+
+    vault = ctx.vault
+    archived = archive_stage.archive_completed_tasks(vault['tasks'], dry_run=args['dry_run'])
+    if archived and not args['dry_run']:
+        archived_paths = {record['path'] for record in archived}
+        vault['tasks'] = [r for r in vault['tasks'] if r['path'] not in archived_paths]
+
+
+def cmd_normalize(ctx, argv):
+    args = parse_options("normalize", argv, [
+        ("--incremental", "skip files not modified since the last successful run"),
+    ])
+    normalize_stage = importlib.import_module(NORMALIZE_MODULE)
+    normalize_stage.normalize_dates(ctx.vault, incremental=args['incremental'])
+
+
+def cmd_clean_imports(ctx, argv):
+    clean_stage = importlib.import_module("clean-imports")
+    args = parse_options("clean-imports", argv, [
+        ("--on-conflict", "what to do when the destination already has a file of the same name",
+         clean_stage.CONFLICT_POLICIES),
+        ("--on-duplicate", "what to do with files whose content is already in the vault",
+         clean_stage.DUPLICATE_POLICIES),
+        ("--bulk", "report progress and summarize counts instead of listing every file"),
+    ])
+    print("=== Cleaning Import Folder ===\n")
+    clean_stage.clean_imports(args['on_conflict'], args['bulk'], args['on_duplicate'])
+    ctx.invalidate()
+
+
+def cmd_weeks(ctx, argv):
+    parse_options("weeks", argv, [])
+    importlib.import_module("calculate-weeks").main()
+
+
+SUBCOMMANDS = {
+    'today': (cmd_today, "normalize, archive and generate all three daily files"),
+    'this-week': (cmd_this_week, "generate this-week.md"),
+    'next-week': (cmd_next_week, "generate next-week.md"),
+    'archive': (cmd_archive, "archive completed one-time tasks"),
+    'normalize': (cmd_normalize, "normalize task dates to YYYY-MM-DD"),
+    'clean-imports': (cmd_clean_imports, "move reviewed files out of import/"),
+    'weeks': (cmd_weeks, "print this week's and next week's dates"),
+}
+
+
+def split_commands(argv):
+    """Split argv into (subcommand, its options) groups."""
+    groups = []
+    for arg in argv:
+        if arg in SUBCOMMANDS:
+            groups.append((arg, []))
+        elif groups:
+            groups[-1][1].append(arg)
+        else:
+            return None
+    return groups
+
+
+def usage():
+    lines = ["usage: taskctl.py SUBCOMMAND [options] [SUBCOMMAND [options] ...]", "", "subcommands:"]
+    lines += [f"  {name:15} {help_text}" for name, (_, help_text) in SUBCOMMANDS.items()]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0 if argv else 2
+
+    groups = split_commands(argv)
+    if groups is None:
+        print(f"taskctl: unknown subcommand '{argv[0]}'\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    ctx = Context()
+    for i, (name, args) in enumerate(groups):
+        if i:
+            print()
+        SUBCOMMANDS[name][0](ctx, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory task store for task-management plugin.
+
+A scanned record is a dict of strings plus a Path, over a kilobyte per
+task. The views only need a few of its fields, so they read them from
+a compact store instead, which is also all that --watch keeps in memory
+between changes:
+
+- TaskRecord: one object per task with __slots__, dates as day ordinals
+  (0 when missing or invalid) and folder, type, status, recurrence and
+  tags as interned symbol IDs.
+- TaskColumns: the same fields as parallel columns, with due, completed,
+  type, status and recurrence in arrays of machine ints. Rows are sorted
+  by due date, so date windows are two binary searches, and other
+  filters are one comparison mapped over a whole column.
+- TaskStore: the TaskRecords of the tasks/ and ideas/ folders, updated
+  file by file, with the today.md sections and the columns of the
+  tasks outside them built once per change.
+
+All share a Symbols table mapping strings to small ints, so every
+distinct tag or status string, and every distinct list of tags, is
+stored once however many tasks carry it.
+"""
+
+import operator
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import compress, repeat
+
+from dueindex import date_ordinal
+
+
+class Symbols:
+    """Interned strings, numbered from 1 in order of first use (0 is None)."""
+
+    def __init__(self):
+        self._ids = {}
+        self._values = [None]
+        self._tag_lists = {}
+
+    def __len__(self):
+        return len(self._values) - 1
+
+    def id(self, value):
+        """Return the ID of `value`, interning it if new; None and '' are 0."""
+        return self._intern(value) if value else 0
+
+    def _intern(self, value):
+        if not isinstance(value, str):
+            value = str(value)
+        symbol = self._ids.get(value)
+        if symbol is None:
+            symbol = self._ids[value] = len(self._values)
+            self._values.append(value)
+        return symbol
+
+    def find(self, value):
+        """Return the ID of `value` without interning it (0 if unknown)."""
+        return self._ids.get(value, 0)
+
+    def tag_list(self, tags):
+        """Return a shared tuple of the IDs of `tags`, in their order."""
+        key = tuple(self._intern(tag) for tag in tags)
+        return self._tag_lists.setdefault(key, key)
+
+    def __getitem__(self, symbol):
+        return self._values[symbol]
+
+
+def _tag_ids(record, symbols):
+    tags = record.get('tags') or ()
+    if isinstance(tags, str):
+        tags = (tags,)
+    return symbols.tag_list(tags)
+
+
+def _iso(ordinal):
+    return date.fromordinal(ordinal).isoformat()
+
+
+class TaskRecord:
+    """One task with ordinal dates and interned strings."""
+
+    __slots__ = ('name', 'folder', 'due', 'completed', 'type', 'status', 'tags',
+                 'recurrence', 'recurrence_day')
+
+    def __init__(self, name, folder, due, completed, type, status, tags,
+                 recurrence=0, recurrence_day=0):
+        self.name = name
+        self.folder = folder
+        self.due = due
+        self.completed = completed
+        self.type = type
+        self.status = status
+        self.tags = tags
+        self.recurrence = recurrence
+        self.recurrence_day = recurrence_day
+
+    @classmethod
+    def from_record(cls, record, folder, symbols):
+        """Build from a scanned record dict found in `folder` (e.g. 'tasks')."""
+        return cls(
+            record['name'],
+            symbols.id(folder),
+            date_ordinal(record.get('due')),
+            date_ordinal(record.get('completed')),
+            symbols.id(record.get('type')),
+            symbols.id(record.get('status')),
+            _tag_ids(record, symbols),
+            symbols.id(record.get('recurrence')),
+            symbols.id(record.get('recurrence_day')),
+        )
+
+    def fields(self, symbols):
+        """
+        Return the task as a small record dict (name, tags and whichever
+        of due, completed, type, status, recurrence and recurrence_day it
+        has), for code written against scanned records.
+        """
+        record = {'name': self.name, 'tags': [symbols[tag] for tag in self.tags]}
+        for key in ('due', 'completed'):
+            if getattr(self, key):
+                record[key] = _iso(getattr(self, key))
+        for key in ('type', 'status', 'recurrence', 'recurrence_day'):
+            if getattr(self, key):
+                record[key] = symbols[getattr(self, key)]
+        return record
+
+    def due_date(self):
+        """The due date as a datetime.date, or None."""
+        return date.fromordinal(self.due) if self.due else None
+
+    def tag_names(self, symbols):
+        return [symbols[tag] for tag in self.tags]
+
+    def __repr__(self):
+        return f"TaskRecord({self.name!r}, due={self.due_date()})"
+
+
+def _bound(value):
+    """Turn a YYYY-MM-DD string or date into an ordinal; ints pass through."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, date):
+        return value.toordinal()
+    ordinal = date_ordinal(value)
+    if not ordinal:
+        raise ValueError(f"invalid date: {value!r} (expected YYYY-MM-DD)")
+    return ordinal
+
+
+class TaskColumns:
+    """
+    Tasks as columns sorted by (due, name); undated tasks come first.
+
+    Row numbers index every column. Query methods return row numbers
+    (a range or a list, in due order) that can be narrowed further with
+    where() and turned back into names or TaskRecords.
+    """
+
+    def __init__(self, tasks, symbols):
+        """Build from TaskRecords interned with `symbols`."""
+        self.symbols = symbols
+        rows = sorted(tasks, key=lambda task: (task.due, task.name))
+        self.names = [task.name for task in rows]
+        self.folders = array('I', [task.folder for task in rows])
+        self.due = array('l', [task.due for task in rows])
+        self.completed = array('l', [task.completed for task in rows])
+        self.types = array('I', [task.type for task in rows])
+        self.statuses = array('I', [task.status for task in rows])
+        self.recurrences = array('I', [task.recurrence for task in rows])
+        self.recurrence_days = array('I', [task.recurrence_day for task in rows])
+        self.tags = [task.tags for task in rows]
+        # Rows before this one have no due date
+        self._first_dated = bisect_right(self.due, 0)
+
+    @classmethod
+    def from_records(cls, records, folder='tasks', symbols=None):
+        """Build from scanned record dicts found in `folder`."""
+        symbols = symbols if symbols is not None else Symbols()
+        return cls((TaskRecord.from_record(r, folder, symbols) for r in records), symbols)
+
+    def __len__(self):
+        return len(self.names)
+
+    def between(self, start=None, end=None):
+        """Rows due from `start` to `end`, inclusive; None is open-ended."""
+        lo = self._first_dated if start is None else max(
+            self._first_dated, bisect_left(self.due, _bound(start)))
+        hi = len(self.due) if end is None else bisect_right(self.due, _bound(end))
+        return range(lo, max(lo, hi))
+
+    def before(self, day):
+        """Rows due strictly before `day` (i.e. overdue as of `day`)."""
+        return self.between(None, _bound(day) - 1)
+
+    def on(self, day):
+        """Rows due on exactly `day`."""
+        return self.between(day, day)
+
+    def where(self, column, op, value, rows=None):
+        """
+        Rows (of `rows`, default all) where `op(column[row], value)`.
+
+        `column` is one of the array columns ('due', 'completed', 'types',
+        'statuses', 'recurrences', 'folders'); dates may be given as
+        YYYY-MM-DD and strings as symbols. The comparison is mapped over
+        the column in one pass, e.g. where('completed', operator.eq, 0)
+        for open tasks.
+        """
+        values = getattr(self, column)
+        if column in ('due', 'completed'):
+            value = _bound(value) if value else 0
+        elif isinstance(value, str):
+            value = self.symbols.find(value)
+        if rows is None:
+            return list(compress(range(len(values)), map(op, values, repeat(value))))
+        if isinstance(rows, range) and rows.step == 1:
+            matches = map(op, values[rows.start:rows.stop], repeat(value))
+            return list(compress(rows, matches))
+        return [row for row in rows if op(values[row], value)]
+
+    def tagged(self, tag, rows=None):
+        """Rows carrying `tag`."""
+        symbol = self.symbols.find(tag)
+        if not symbol:
+            return []
+        rows = range(len(self.tags)) if rows is None else rows
+        return [row for row in rows if symbol in self.tags[row]]
+
+    def overdue(self, today):
+        """Open rows (no completed date) due before `today`."""
+        return self.where('completed', operator.eq, 0, self.before(today))
+
+    def recurring(self, rows=None):
+        """Rows with a recurrence: rule."""
+        return self.where('recurrences', operator.ne, 0, rows)
+
+    def due_str(self, row):
+        """A dated row's due date as YYYY-MM-DD."""
+        return _iso(self.due[row])
+
+    def by_day(self, rows):
+        """Names of dated `rows` grouped by YYYY-MM-DD due date, in row order."""
+        days = {}
+        for row in rows:
+            days.setdefault(_iso(self.due[row]), []).append(self.names[row])
+        return days
+
+    def row(self, row):
+        """Rebuild the TaskRecord for one row."""
+        return TaskRecord(
+            self.names[row], self.folders[row], self.due[row], self.completed[row],
+            self.types[row], self.statuses[row], self.tags[row],
+            self.recurrences[row], self.recurrence_days[row],
+        )
+
+    def names_of(self, rows):
+        return [self.names[row] for row in rows]
+
+
+class TaskStore:
+    """
+    TaskRecords of some vault folders, keyed by task name.
+
+    Built from scanned records, then kept up to date one file at a time
+    with put() and remove(). Listings are in file name order, like
+    scan_vault(). Section membership and the columns of unsectioned
+    tasks are computed on first use and reused until the next change.
+    """
+
+    def __init__(self, vault=None, folders=('tasks', 'ideas')):
+        self.symbols = Symbols()
+        self._folders = {name: {} for name in folders}
+        self._derived = None
+        for name, records in (vault or {}).items():
+            if name in self._folders:
+                for record in records:
+                    self.put(name, record)
+
+    def put(self, folder, record):
+        """Add or replace a scanned record; returns the TaskRecord it replaced."""
+        self._derived = None
+        task = TaskRecord.from_record(record, folder, self.symbols)
+        tasks = self._folders[folder]
+        old = tasks.get(task.name)
+        tasks[task.name] = task
+        return old
+
+    def remove(self, folder, name):
+        """Drop a task by name; returns its TaskRecord, or None if absent."""
+        old = self._folders[folder].pop(name, None)
+        if old is not None:
+            self._derived = None
+        return old
+
+    def __len__(self):
+        return sum(len(tasks) for tasks in self._folders.values())
+
+    def records(self, folder):
+        """The folder's TaskRecords in file name order."""
+        return sorted(self._folders[folder].values(), key=lambda task: task.name + '.md')
+
+    def fields(self, task):
+        """Return a TaskRecord as a small record dict (see TaskRecord.fields)."""
+        return task.fields(self.symbols)
+
+    def with_status(self, folder, status):
+        """Names of the folder's tasks whose status: is `status`, in file order."""
+        symbol = self.symbols.find(status)
+        if not symbol:
+            return []
+        return [task.name for task in self.records(folder) if task.status == symbol]
+
+    def _sections_and_columns(self, rules):
+        if self._derived is not None and self._derived[0] is rules:
+            return self._derived[1:]
+
+        # A rule is evaluated once per distinct list of tags, not per task
+        compiled = [
+            (rule['name'],
+             {self.symbols.find(tag) for tag in rule['include']} - {0},
+             {self.symbols.find(tag) for tag in rule['exclude']} - {0})
+            for rule in rules
+        ]
+        claimed_by = {}
+
+        def section_of(tags):
+            if tags not in claimed_by:
+                tag_set = set(tags)
+                claimed_by[tags] = next(
+                    (name for name, include, exclude in compiled
+                     if tag_set & include and not tag_set & exclude),
+                    None,
+                )
+            return claimed_by[tags]
+
+        sections = {rule['name']: [] for rule in rules}
+        unsectioned = []
+        for task in self.records('tasks'):
+            section = section_of(task.tags)
+            if section is None:
+                unsectioned.append(task)
+            else:
+                sections[section].append(task.name)
+
+        columns = TaskColumns(unsectioned, self.symbols)
+        self._derived = (rules, sections, columns)
+        return sections, columns
+
+    def sections(self, rules):
+        """
+        Return {section name: task names} for compiled section rules, in
+        rule order; a task belongs to the first section that matches it.
+        """
+        return self._sections_and_columns(rules)[0]
+
+    def due_columns(self, rules):
+        """TaskColumns of the tasks not claimed by any of the section rules."""
+        return self._sections_and_columns(rules)[1]
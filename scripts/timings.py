@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-phase instrumentation for task-management scripts.
+
+Wrap each phase of a run in `timer.phase(name)` to record its wall time,
+files read and written under tasks_root, bytes read and subprocesses
+spawned. File and process counts come from a Python audit hook, which is
+only installed when instrumentation is enabled, so normal runs pay
+nothing for it.
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from fileio import IO_STATS
+
+SPAWN_EVENTS = {"subprocess.Popen", "os.system", "os.posix_spawn", "os.spawn", "os.exec", "os.fork"}
+
+COLUMNS = ("wall_ms", "files_read", "bytes_read", "files_written", "subprocesses")
+
+
+class PhaseTimer:
+    """Collects per-phase counters; a disabled timer is a no-op."""
+
+    def __init__(self, root=None, enabled=True):
+        self.enabled = enabled
+        self.root = str(root) if root else None
+        self.phases = []
+        self._counts = {"files_read": 0, "files_written": 0, "subprocesses": 0}
+        if enabled:
+            sys.addaudithook(self._audit)
+
+    def _audit(self, event, args):
+        """Count file opens under tasks_root and process spawns."""
+        if event in SPAWN_EVENTS:
+            self._counts["subprocesses"] += 1
+        elif event == "open":
+            path, mode, flags = args
+            if isinstance(path, int):
+                return
+            path = os.fsdecode(path)
+            if self.root and not path.startswith(self.root):
+                return
+            if mode is not None:
+                writing = any(c in mode for c in "wax+")
+            else:
+                writing = (flags & os.O_ACCMODE) != os.O_RDONLY
+            self._counts["files_written" if writing else "files_read"] += 1
+
+    def _snapshot(self):
+        return dict(self._counts, bytes_read=IO_STATS["bytes_read"], time=time.perf_counter())
+
+    @contextmanager
+    def phase(self, name):
+        """Record counters for the code run inside this block."""
+        if not self.enabled:
+            yield
+            return
+        before = self._snapshot()
+        try:
+            yield
+        finally:
+            after = self._snapshot()
+            entry = {"name": name, "wall_ms": round((after["time"] - before["time"]) * 1000, 2)}
+            for key in COLUMNS[1:]:
+                entry[key] = after[key] - before[key]
+            self.phases.append(entry)
+
+    def totals(self):
+        """Sum every column across all recorded phases."""
+        total = {"name": "total"}
+        for key in COLUMNS:
+            total[key] = sum(phase[key] for phase in self.phases)
+        total["wall_ms"] = round(total["wall_ms"], 2)
+        return total
+
+    def report(self, file=None):
+        """Print a table of phases to stderr (or `file`)."""
+        file = file or sys.stderr
+        print("\n=== Timings ===", file=file)
+        print(f"{'phase':<16}" + "".join(f"{col:>15}" for col in COLUMNS), file=file)
+        for row in self.phases + [self.totals()]:
+            print(f"{row['name']:<16}" + "".join(f"{row[col]:>15}" for col in COLUMNS), file=file)
+
+    def write_json(self, path):
+        """Write the phases and totals to a JSON file."""
+        with open(path, "w") as f:
+            json.dump({"phases": self.phases, "total": self.totals()}, f, indent=2)
+            f.write("\n")
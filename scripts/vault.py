@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Frontmatter index for task-management plugin.
+
+Scans task folders once and parses each file's YAML frontmatter into a
+plain dict, so views can be answered from memory instead of grepping
+every file for every query. parse_frontmatter() is the one parser every
+script uses: flat headers take a fast path and only complex ones pay
+for a YAML parser.
+
+Parsed frontmatter is persisted in a SQLite cache under tasks_root,
+keyed by path plus mtime and size, so warm runs only need to stat each
+file and re-parse the ones that changed.
+"""
+
+import json
+import os
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from config import get_tasks_root, get_folder, get_scan_workers
+from fileio import read_frontmatter
+
+CACHE_FILENAME = ".task-index.sqlite"
+CACHE_VERSION = 2
+
+# Keys added to records by the scanner rather than read from frontmatter
+RECORD_META_KEYS = ('name', 'path', 'mtime_ns')
+
+FRONTMATTER_PATTERN = re.compile(r'\A---[ \t]*\n.*?\n---[ \t]*(?:\n|\Z)', re.DOTALL)
+FIELD_PATTERN = re.compile(r'^([A-Za-z_][\w-]*):\s*(.*)$')
+LIST_ITEM_PATTERN = re.compile(r'^[ \t]*-(?:[ \t]+(.*))?$')
+
+# Plain scalars starting with one of these mean something else in YAML
+# (block scalars, flow collections, anchors, aliases, tags, directives)
+YAML_INDICATORS = frozenset('|>[]{}&*!%@`')
+# Values starting with these need a closer look than a plain scalar
+SPECIAL_FIRST_CHARS = YAML_INDICATORS | {'"', "'"}
+
+
+def unquote(value):
+    """Strip matching single or double quotes around a scalar."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+        return value[1:-1]
+    return value
+
+
+def _is_simple_scalar(value):
+    """
+    Return True if the fast path reads `value` exactly as YAML would: a
+    plain scalar without a trailing comment, or a quoted one without
+    escapes or embedded quotes.
+    """
+    if not value:
+        return True
+    first = value[0]
+    if first in ('"', "'"):
+        return (len(value) >= 2 and value[-1] == first and first not in value[1:-1]
+                and not (first == '"' and '\\' in value))
+    return first not in YAML_INDICATORS and ' #' not in value and '\t#' not in value
+
+
+def _parse_inline_list(value):
+    """Parse an inline YAML list like [a, b, c]."""
+    inner = value.strip()[1:-1]
+    return [unquote(item) for item in inner.split(',') if item.strip()]
+
+
+def _parse_flat(lines, strict):
+    """
+    Parse `key: value` lines, inline lists and block lists, stopping at
+    the closing `---`. `lines` starts after the opening `---`.
+
+    With `strict`, returns None at the first line the fast path can't
+    read exactly as YAML would (nested maps, multi-line strings,
+    comments, escapes...). Otherwise such lines are skipped.
+    """
+    fields = {}
+    current_list = None
+
+    for line in lines:
+        match = FIELD_PATTERN.match(line)
+        if match is None:
+            stripped = line.strip()
+            if stripped == '---':
+                break
+            if not stripped or stripped[0] == '#':
+                continue
+            item = LIST_ITEM_PATTERN.match(line) if current_list is not None else None
+            if item:
+                value = (item.group(1) or '').strip()
+                if strict and not _is_simple_scalar(value):
+                    return None
+                current_list.append(unquote(value))
+            elif strict:
+                return None
+            else:
+                current_list = None
+            continue
+
+        key, value = match.group(1), match.group(2).strip()
+        if not value:
+            # Possibly the start of a block list
+            current_list = []
+            fields[key] = current_list
+            continue
+        current_list = None
+        first = value[0]
+        if first == '[' and value[-1] == ']':
+            if strict and not all(_is_simple_scalar(i.strip()) for i in value[1:-1].split(',')):
+                return None
+            fields[key] = _parse_inline_list(value)
+        elif first in SPECIAL_FIRST_CHARS or '#' in value:
+            if strict and not _is_simple_scalar(value):
+                return None
+            fields[key] = unquote(value)
+        else:
+            fields[key] = value
+
+    # Empty block-list keys with no items are just empty values
+    for key, value in fields.items():
+        if value == [] and key != 'tags':
+            fields[key] = ''
+
+    return fields
+
+
+@lru_cache(maxsize=None)
+def _yaml_loader():
+    """
+    The fastest available YAML loader that keeps scalars as strings, or
+    None without PyYAML. Like the fast path, it leaves dates, numbers and
+    booleans exactly as written and never constructs arbitrary objects.
+    """
+    try:
+        import yaml
+    except ImportError:
+        return None
+    # CBaseLoader needs PyYAML built against libyaml
+    return getattr(yaml, 'CBaseLoader', yaml.BaseLoader)
+
+
+def _parse_yaml(text):
+    """Parse header text with a real YAML loader; None if unavailable or invalid."""
+    loader = _yaml_loader()
+    if loader is None:
+        return None
+    import yaml
+    try:
+        data = yaml.load(text, Loader=loader)
+    except yaml.YAMLError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_frontmatter(content):
+    """
+    Parse the frontmatter block at the top of a markdown file.
+
+    Flat `key: value` lines, inline lists (`tags: [a, b]`) and block
+    lists (`tags:` followed by `  - a` lines) take a fast path. Headers
+    using anything else (nested maps, multi-line or escaped strings,
+    comments) go through PyYAML's libyaml loader when available, which
+    yields the same strings and lists; if YAML can't parse them either,
+    the fast path reads what it can. Returns an empty dict if the file
+    has no frontmatter.
+    """
+    lines = content.split('\n')
+    if not lines or lines[0].strip() != '---':
+        return {}
+
+    fields = _parse_flat(lines[1:], strict=True)
+    if fields is None:
+        end = next((i for i in range(1, len(lines)) if lines[i].strip() == '---'), len(lines))
+        fields = _parse_yaml('\n'.join(lines[1:end]))
+        if fields is None:
+            fields = _parse_flat(lines[1:], strict=False)
+    return fields
+
+
+def split_frontmatter(content):
+    """Split a file's full text into (frontmatter fields, body text)."""
+    match = FRONTMATTER_PATTERN.match(content)
+    if not match:
+        return {}, content
+    return parse_frontmatter(match.group(0)), content[match.end():]
+
+
+def read_record(path):
+    """Read a file's frontmatter (never its body) into a record dict."""
+    path = Path(path)
+    try:
+        header, _ = read_frontmatter(path)
+    except (OSError, UnicodeDecodeError):
+        header = ''
+
+    record = parse_frontmatter(header)
+    tags = record.get('tags', [])
+    if isinstance(tags, str):
+        tags = [tags] if tags else []
+    record['tags'] = tags
+    record['name'] = path.stem
+    record['path'] = path
+    return record
+
+
+def open_cache(root=None):
+    """
+    Open (creating if needed) the frontmatter cache under tasks_root.
+
+    Returns a sqlite3 connection, or None if the cache can't be used
+    (e.g. a read-only vault), in which case callers just parse files.
+    """
+    cache_path = Path(root or get_tasks_root()) / CACHE_FILENAME
+    try:
+        conn = sqlite3.connect(cache_path)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_VERSION:
+            conn.execute("DROP TABLE IF EXISTS files")
+            conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " folder TEXT NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " fields TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS files_folder ON files (folder)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        return conn
+    except sqlite3.Error:
+        return None
+
+
+def _record_from_cache(path, fields_json):
+    """Rebuild a record dict from its cached JSON fields."""
+    record = json.loads(fields_json)
+    record['name'] = path.stem
+    record['path'] = path
+    return record
+
+
+def _record_to_cache(record):
+    """Serialize a record's frontmatter fields for the cache."""
+    fields = {k: v for k, v in record.items() if k not in RECORD_META_KEYS}
+    return json.dumps(fields, separators=(',', ':'))
+
+
+def list_markdown_files(folder):
+    """
+    Return DirEntry objects for the .md files in a folder, sorted by name.
+
+    Hidden files (including in-progress atomic writes) are ignored. The
+    entries cache their stat result, so callers can stat them cheaply.
+    """
+    with os.scandir(folder) as it:
+        entries = [
+            entry for entry in it
+            if entry.name.endswith('.md')
+            and not entry.name.startswith('.')
+            and entry.is_file()
+        ]
+    entries.sort(key=lambda entry: entry.name)
+    return entries
+
+
+def read_records(paths, workers=None):
+    """
+    Read and parse several files, in parallel when workers > 1.
+
+    Results come back in the same order as `paths`, whatever order the
+    reads finish in, so output stays deterministic.
+    """
+    if workers is None:
+        workers = get_scan_workers()
+    if workers <= 1 or len(paths) <= 1:
+        return [read_record(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(read_record, paths))
+
+
+def scan_folder(folder, cache=None, workers=None):
+    """
+    Return records for every .md file in a folder, sorted by name.
+
+    With a cache connection, files whose mtime and size match the cached
+    entry are not read at all; new or changed files are re-parsed and
+    entries for deleted files are dropped. Files that do need reading
+    are read by a thread pool of `workers` (default from config).
+    """
+    folder = Path(folder)
+    try:
+        entries = list_markdown_files(folder)
+    except FileNotFoundError:
+        if cache is not None:
+            cache.execute("DELETE FROM files WHERE folder = ?", (str(folder),))
+            cache.commit()
+        return []
+
+    cached = {}
+    if cache is not None:
+        cached = {
+            row[0]: row[1:]
+            for row in cache.execute(
+                "SELECT path, mtime_ns, size, fields FROM files WHERE folder = ?",
+                (str(folder),),
+            )
+        }
+
+    # Each slot is [path, stat, record]; record stays None until parsed
+    slots = []
+    to_read = []
+    for entry in entries:
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+
+        path = folder / entry.name
+        hit = cached.pop(str(path), None)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            slots.append([path, st, _record_from_cache(path, hit[2])])
+        else:
+            to_read.append(len(slots))
+            slots.append([path, st, None])
+
+    parsed = read_records([slots[i][0] for i in to_read], workers)
+    updates = []
+    for i, record in zip(to_read, parsed):
+        path, st, _ = slots[i]
+        slots[i][2] = record
+        updates.append((str(path), str(folder), st.st_mtime_ns, st.st_size, _record_to_cache(record)))
+
+    records = []
+    for _, st, record in slots:
+        record['mtime_ns'] = st.st_mtime_ns
+        records.append(record)
+
+    if cache is not None:
+        if updates:
+            cache.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", updates)
+        if cached:
+            # Anything left over was deleted or moved since the last run
+            cache.executemany("DELETE FROM files WHERE path = ?", [(k,) for k in cached])
+        if updates or cached:
+            cache.commit()
+
+    return records
+
+
+def scan_vault(names):
+    """
+    Scan several configured folders in one pass over a shared cache.
+
+    Returns a dict mapping folder name (e.g. "tasks") to its records, so
+    a pipeline of stages can share one parsed file set.
+    """
+    cache = open_cache()
+    workers = get_scan_workers()
+    vault = {name: scan_folder(get_folder(name), cache, workers) for name in names}
+    if cache is not None:
+        cache.close()
+    return vault
+
+
+def read_meta(key, default=None):
+    """Read a value a script stored in the cache (e.g. its last run time)."""
+    cache = open_cache()
+    if cache is None:
+        return default
+    row = cache.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    cache.close()
+    return json.loads(row[0]) if row else default
+
+
+def write_meta(key, value):
+    """Store a small JSON-serializable value in the cache."""
+    cache = open_cache()
+    if cache is None:
+        return
+    cache.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value)))
+    cache.commit()
+    cache.close()
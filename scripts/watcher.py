@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Filesystem change watching for task-management plugin.
+
+Uses Linux inotify (through ctypes, no extra dependencies) when it's
+available and falls back to polling directory mtimes and sizes
+everywhere else. Both watchers report changed .md paths the same way.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+# inotify event masks (from <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _is_task_file(name):
+    """Only visible markdown files matter; temp files start with '.'."""
+    return name.endswith(".md") and not name.startswith(".")
+
+
+class InotifyWatcher:
+    """Watch directories with inotify; only works on Linux."""
+
+    def __init__(self, dirs):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify is not available on this platform")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._dirs = {}
+        for directory in dirs:
+            directory = Path(directory)
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                os.close(self._fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self._dirs[wd] = directory
+
+    def wait(self, timeout):
+        """Block up to `timeout` seconds; return the set of changed paths."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, _mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            if wd in self._dirs and _is_task_file(name):
+                changed.add(self._dirs[wd] / name)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Watch directories by comparing file mtimes and sizes periodically."""
+
+    def __init__(self, dirs, interval=2.0):
+        self._dirs = [Path(d) for d in dirs]
+        self._interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        for directory in self._dirs:
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if _is_task_file(entry.name):
+                            st = entry.stat()
+                            snapshot[directory / entry.name] = (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                continue
+        return snapshot
+
+    def wait(self, timeout):
+        """Sleep up to `timeout` seconds; return the set of changed paths."""
+        time.sleep(min(timeout, self._interval))
+        current = self._take_snapshot()
+        changed = {
+            path for path in current.keys() | self._snapshot.keys()
+            if current.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(dirs, poll_interval=2.0):
+    """Return an inotify watcher if possible, otherwise a polling one."""
+    try:
+        return InotifyWatcher(dirs)
+    except (OSError, AttributeError):
+        return PollingWatcher(dirs, poll_interval)